@@ -1,21 +1,37 @@
-from typing import Dict, Generator
+from array import array
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Generator, List, Optional, Sequence
 from functools import lru_cache
 
+try:
+    import numpy as np
+except ImportError: # numpy необязателен, без него пакетный API работает в цикле
+    np = None
+
+# таблица периода Пизано (период <= 6m) строится только для модулей не больше этого значения
+# и только если она окупается в пакете (см. _table_pays_off), иначе - модульное быстрое удвоение
+PISANO_TABLE_LIMIT: int = 1 << 16
+# кеш таблиц периодов ограничен суммарным числом элементов (по 8 байт), а не числом таблиц,
+# чтобы в нем помещались все модули типичного пакета
+PISANO_CACHE_SIZE: int = 1 << 22
+_pisano_cache: 'OrderedDict[int, array]' = OrderedDict()
+_pisano_cache_size: List[int] = [0] # текущий суммарный размер таблиц в кеше
+
 # Наивное и простое решение через рекурсию
 # Данное решение крайне неэффективно, так как
 # при больших значениях n дерево вызовов функции
 # растет в геометрической прогрессии.
-# например, для fib(20) функция будет вызвана 21891 раз
-def fib(n: int) -> int:
+# например, для fib_naive(20) функция будет вызвана 21891 раз
+def fib_naive(n: int) -> int:
     if n < 2:
         return n
-    return fib(n - 2) + fib(n - 1)
+    return fib_naive(n - 2) + fib_naive(n - 1)
 
 # Оптимизация через мемоизацию
 memo: Dict[int, int] = {0: 0, 1:1} # базовые случаи
 def fib_with_memo(n: int) -> int:
     if n not in memo:
-        memo[n] = fib(n - 1) + fib(n - 2)
+        memo[n] = fib_with_memo(n - 1) + fib_with_memo(n - 2)
     return memo[n]
 
 # Мемоизация через lru_cache, встроенный в стандартную библиотеку
@@ -23,7 +39,152 @@ def fib_with_memo(n: int) -> int:
 def fib_lru(n: int) -> int:
     if n < 2:
         return n
-    return fib(n - 2) + fib(n - 1)
+    return fib_lru(n - 2) + fib_lru(n - 1)
+
+# Быстрое удвоение: O(log n) умножений больших чисел
+# F(2k) = F(k) * (2F(k+1) - F(k)), F(2k+1) = F(k)^2 + F(k+1)^2
+# проходим по битам n от старшего к младшему, поддерживая пару (F(k), F(k+1))
+def fib(n: int) -> int:
+    if n < 0:
+        raise ValueError('n must be non-negative')
+    a: int = 0 # F(k)
+    b: int = 1 # F(k+1)
+    for bit in bin(n)[2:]:
+        c: int = a * (2 * b - a) # F(2k)
+        d: int = a * a + b * b # F(2k+1)
+        if bit == '1':
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a
+
+# Кеш для повторяющихся запросов: ограниченный размер и вытеснение по LRU
+def make_fib_cache(maxsize: int = 128) -> Callable[[int], int]:
+    return lru_cache(maxsize=maxsize)(fib)
+
+fib_cached: Callable[[int], int] = make_fib_cache()
+
+# F(n) mod m быстрым удвоением, промежуточные числа не превышают m^2
+def fib_mod(n: int, m: int) -> int:
+    if n < 0:
+        raise ValueError('n must be non-negative')
+    if m <= 0:
+        raise ValueError('m must be positive')
+    a: int = 0
+    b: int = 1 % m
+    for bit in bin(n)[2:]:
+        c: int = a * (2 * b - a) % m
+        d: int = (a * a + b * b) % m
+        if bit == '1':
+            a, b = d, (c + d) % m
+        else:
+            a, b = c, d
+    return a
+
+# один период Пизано: последовательность F(i) mod m повторяется с периодом len(table)
+# таблицы кешируются с вытеснением давно не использованных по суммарному размеру
+def pisano_table(m: int) -> array:
+    table: Optional[array] = _pisano_cache.get(m)
+    if table is not None:
+        _pisano_cache.move_to_end(m)
+        return table
+    table = _compute_pisano_table(m)
+    _pisano_cache[m] = table
+    _pisano_cache_size[0] += len(table)
+    while _pisano_cache_size[0] > PISANO_CACHE_SIZE and len(_pisano_cache) > 1:
+        _, evicted = _pisano_cache.popitem(last=False)
+        _pisano_cache_size[0] -= len(evicted)
+    return table
+
+def pisano_cache_clear() -> None:
+    _pisano_cache.clear()
+    _pisano_cache_size[0] = 0
+
+def _compute_pisano_table(m: int) -> array:
+    if m <= 0:
+        raise ValueError('m must be positive')
+    table: array = array('Q', [0])
+    if m == 1:
+        return table
+    a: int = 1
+    b: int = 1
+    while not (a == 0 and b == 1):
+        table.append(a)
+        a, b = b, (a + b) % m
+    return table
+
+# пакетный расчет F(ns[i]) mod ms[i], результат - массив того же порядка
+def fib_mod_batch(ns: Sequence[int], ms: Sequence[int]) -> array:
+    if len(ns) != len(ms):
+        raise ValueError('ns and ms must have the same length')
+    if np is not None and len(ns) > 0:
+        ns_array: np.ndarray = np.asarray(ns)
+        ms_array: np.ndarray = np.asarray(ms)
+        # только целые, помещающиеся в int64/uint64; огромные числа (dtype object) считаются в цикле
+        if ns_array.dtype.kind in 'iu' and ms_array.dtype.kind in 'iu':
+            # знак проверяется до приведения к uint64, иначе отрицательные значения молча "заворачиваются"
+            if ns_array.min() < 0:
+                raise ValueError('n must be non-negative')
+            if ms_array.min() <= 0:
+                raise ValueError('m must be positive')
+            return _fib_mod_batch_numpy(ns_array.astype(np.uint64), ms_array.astype(np.uint64))
+    results: array = array('Q', bytes(8 * len(ns)))
+    if len(ns) == 0:
+        return results
+    bits: int = max(ns).bit_length()
+    counts: Counter = Counter(ms)
+    # таблицы текущего пакета держим локально, чтобы не вытеснять их из общего кеша;
+    # None - модуль считается быстрым удвоением
+    tables: Dict[int, Optional[array]] = {}
+    for i, (n, m) in enumerate(zip(ns, ms)):
+        if n < 0:
+            raise ValueError('n must be non-negative')
+        if m not in tables:
+            tables[m] = pisano_table(m) if 0 < m <= PISANO_TABLE_LIMIT and _table_pays_off(m, counts[m], bits) else None
+        table: Optional[array] = tables[m]
+        results[i] = table[n % len(table)] if table is not None else fib_mod(n, m)
+    return results
+
+# верхняя граница периода Пизано: pi(m) <= 6m
+def _pisano_period_bound(m: int) -> int:
+    return 6 * m
+
+# таблица стоит до 6m шагов сложения, каждый запрос без нее - около log2(n) шагов удвоения,
+# поэтому она строится, только если запросов с этим модулем достаточно (или таблица уже в кеше)
+def _table_pays_off(m: int, count: int, bits: int) -> bool:
+    return m in _pisano_cache or count * bits > _pisano_period_bound(m)
+
+# векторизованный вариант: таблицы окупающихся модулей пакета склеиваются в один массив,
+# и все их запросы отвечаются одной индексной выборкой (модули и число запросов к каждому
+# находятся через bincount, без сортировки запросов); остальные считаются быстрым удвоением
+def _fib_mod_batch_numpy(ns: 'np.ndarray', ms: 'np.ndarray') -> array:
+    results: np.ndarray = np.zeros(len(ns), dtype=np.uint64)
+    rest: np.ndarray = ms > PISANO_TABLE_LIMIT # запросы без таблицы
+    small: np.ndarray = np.flatnonzero(~rest)
+    if len(small) > 0:
+        small_ms: np.ndarray = ms[small].astype(np.intp)
+        counts: np.ndarray = np.bincount(small_ms)
+        bits: int = int(ns.max()).bit_length()
+        moduli: np.ndarray = np.flatnonzero(counts)
+        moduli = moduli[np.array([_table_pays_off(m, count, bits) for m, count in
+                                  zip(moduli.tolist(), counts[moduli].tolist())], dtype=bool)]
+        group_of: np.ndarray = np.full(len(counts), -1, dtype=np.intp) # модуль -> номер таблицы
+        group_of[moduli] = np.arange(len(moduli))
+        groups: np.ndarray = group_of[small_ms]
+        rest[small[groups < 0]] = True
+        if len(moduli) > 0:
+            tables: List[np.ndarray] = [np.frombuffer(pisano_table(m), dtype=np.uint64) for m in moduli.tolist()]
+            lengths: np.ndarray = np.array([len(table) for table in tables], dtype=np.uint64)
+            offsets: np.ndarray = np.zeros(len(tables), dtype=np.uint64)
+            np.cumsum(lengths[:-1], out=offsets[1:])
+            tabled: np.ndarray = groups >= 0
+            positions: np.ndarray = small[tabled]
+            groups = groups[tabled]
+            results[positions] = np.concatenate(tables)[offsets[groups] + ns[positions] % lengths[groups]]
+    if rest.any():
+        positions = np.flatnonzero(rest)
+        results[positions] = [fib_mod(n, m) for n, m in zip(ns[positions].tolist(), ms[positions].tolist())]
+    return array('Q', results.tobytes())
 
 # Итеративное решение
 def fib_iterative(n: int) -> int:
@@ -44,3 +205,65 @@ def fib_by_generator(n: int) -> Generator[int, None, None]:
     for _ in range(1, n):
         last, next = next, last + next
         yield next # главный этап генерации
+
+# Сравнение всех вариантов на разных n
+# рекурсивные варианты ограничены глубиной стека, наивный - экспоненциальным временем
+def benchmark(ns: List[int] = [20, 25, 500, 10_000, 100_000, 1_000_000]) -> None:
+    from collections import deque
+    from timeit import default_timer as timer
+    limits: Dict[str, int] = {'fib_naive': 25, 'fib_with_memo': 500, 'fib_lru': 500,
+                              'fib_iterative': 100_000, 'fib_by_generator': 100_000}
+    variants: Dict[str, Callable[[int], int]] = {
+        'fib_naive': fib_naive,
+        'fib_with_memo': fib_with_memo,
+        'fib_lru': fib_lru,
+        'fib_iterative': fib_iterative,
+        'fib_by_generator': lambda n: deque(fib_by_generator(n), maxlen=1)[0],
+        'fib': fib,
+    }
+    for n in ns:
+        expected: int = fib(n)
+        row: List[str] = []
+        for name, variant in variants.items():
+            if n > limits.get(name, n):
+                row.append('{}: -'.format(name))
+                continue
+            memo.clear()
+            memo.update({0: 0, 1: 1})
+            fib_lru.cache_clear()
+            start: float = timer()
+            result: int = variant(n)
+            elapsed: float = timer() - start
+            assert result == expected
+            row.append('{}: {:.4f}s'.format(name, elapsed))
+        print('n = {:>9} | {}'.format(n, ' | '.join(row)))
+
+# пакетные запросы F(n) mod m: сравнение с fib_mod по одному запросу
+def batch_benchmark(size: int = 1_000_000) -> None:
+    from random import randrange
+    from timeit import default_timer as timer
+    ns: List[int] = [randrange(10 ** 12) for _ in range(size)]
+    ms: List[int] = [randrange(2, 1000) for _ in range(size)]
+    pisano_cache_clear()
+    start: float = timer()
+    results: array = fib_mod_batch(ns, ms)
+    print('fib_mod_batch: {} queries in {:.3f}s (cold cache)'.format(size, timer() - start))
+    start = timer()
+    fib_mod_batch(ns, ms)
+    print('fib_mod_batch: {} queries in {:.3f}s (warm cache)'.format(size, timer() - start))
+    start = timer()
+    assert all(results[i] == fib_mod(ns[i], ms[i]) for i in range(1000))
+    print('fib_mod: 1000 queries in {:.3f}s'.format(timer() - start))
+    # редкие большие модули: таблицы не окупаются, запросы идут через быстрое удвоение
+    sparse: List[int] = [randrange(2, PISANO_TABLE_LIMIT) for _ in range(10_000)]
+    pisano_cache_clear()
+    start = timer()
+    fib_mod_batch(ns[:len(sparse)], sparse)
+    print('fib_mod_batch: {} queries with sparse moduli in {:.3f}s'.format(len(sparse), timer() - start))
+
+
+if __name__ == '__main__':
+    print(fib(50), fib_iterative(50), list(fib_by_generator(10)))
+    print('fib(1 000 000) has {} bits'.format(fib_cached(1_000_000).bit_length()))
+    benchmark()
+    batch_benchmark()
@@ -1,6 +1,8 @@
-from typing import TypeVar, Generic, List
+from typing import TypeVar, Generic, Dict, Iterator, List, Tuple
 T = TypeVar('T')
 
+Move = Tuple[int, int, int] # (диск, откуда, куда); диск 1 - самый маленький
+
 
 # решение задачи Башни Ханои через стек
 class Stack(Generic[T]):
@@ -25,12 +27,60 @@ def hanoi(begin: Stack[int], end: Stack[int], temp: Stack[int], n: int) -> None:
         hanoi(begin, end, temp, 1)
         hanoi(temp, end, begin, n - 1)
 
+
+# нерекурсивное решение: ход номер m (с 1) перемещает диск, равный числу
+# младших нулевых битов m плюс один, а стержни определяются формулой
+# (m & (m - 1)) % 3 -> ((m | (m - 1)) + 1) % 3 для башни 0 -> 2 при нечетном n
+# при четном n роли стержней 1 и 2 меняются местами
+def _peg_map(n: int, begin: int, end: int, temp: int) -> Tuple[int, int, int]:
+    return (begin, temp, end) if n % 2 == 1 else (begin, end, temp)
+
+def _move(m: int, pegs: Tuple[int, int, int]) -> Move:
+    disc: int = (m & -m).bit_length()
+    return disc, pegs[(m & (m - 1)) % 3], pegs[((m | (m - 1)) + 1) % 3]
+
+# генератор всех ходов для переноса n дисков с begin на end
+# хранит только номер текущего хода
+def hanoi_moves(n: int, begin: int = 0, end: int = 1, temp: int = 2) -> Iterator[Move]:
+    pegs: Tuple[int, int, int] = _peg_map(n, begin, end, temp)
+    for m in range(1, 2 ** n):
+        yield _move(m, pegs)
+
+# k-й ход (с 1) без перебора предыдущих, O(n)
+def hanoi_move(n: int, k: int, begin: int = 0, end: int = 1, temp: int = 2) -> Move:
+    if not 1 <= k < 2 ** n:
+        raise IndexError('move number out of range')
+    return _move(k, _peg_map(n, begin, end, temp))
+
+# расположение дисков после k ходов, O(n)
+# для каждого стержня возвращается список дисков снизу вверх
+def hanoi_state(n: int, k: int, begin: int = 0, end: int = 1, temp: int = 2) -> Dict[int, List[int]]:
+    if not 0 <= k < 2 ** n:
+        raise IndexError('move number out of range')
+    state: Dict[int, List[int]] = {begin: [], end: [], temp: []}
+    # самый большой из оставшихся дисков либо еще не сдвинут (первая половина ходов),
+    # либо уже лежит на целевом стержне, а меньшие переносятся во второй половине
+    for disc in range(n, 0, -1):
+        half: int = 2 ** (disc - 1)
+        if k < half:
+            state[begin].append(disc)
+            end, temp = temp, end
+        else:
+            state[end].append(disc)
+            k -= half
+            begin, temp = temp, begin
+    return state
+
 if __name__ == '__main__':
     num_discs: int = 3
     tower_a: Stack[int] = Stack()
     tower_b: Stack[int] = Stack()
     tower_c: Stack[int] = Stack()
+    for i in range(num_discs, 0, -1):
+        tower_a.push(i)
     hanoi(tower_a, tower_b, tower_c, num_discs)
     print(tower_a)
     print(tower_b)
-    print(tower_c)
\ No newline at end of file
+    print(tower_c)
+    print(list(hanoi_moves(num_discs)))
+    print(hanoi_move(64, 2 ** 63), hanoi_state(num_discs, 4))
\ No newline at end of file
@@ -1,6 +1,17 @@
 # pi = 3.14159...
 # по формуле Лейбница следующий бесконечный ряд сходится к pi
 # pi = 4/1 - 4/3 + 4/5 - 4/7 + 4/9 - 4/11 ...
+from concurrent.futures import ProcessPoolExecutor
+from math import fsum
+from os import cpu_count
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError: # numpy необязателен, без него используется обычный цикл
+    np = None
+
+CHUNK_SIZE: int = 1 << 20 # сколько членов ряда вычислять за один векторизованный шаг
 
 # простое решение
 # чем больше проходов, тем выше точность
@@ -17,5 +28,64 @@ def calculate_pi(n_terms: int) -> float:
 
     return pi
 
+# сумма членов ряда с номерами [start, stop)
+# с numpy члены считаются блоками по chunk_size, без него - в цикле
+def partial_sum(start: int, stop: int, chunk_size: int = CHUNK_SIZE) -> float:
+    if np is None:
+        operation: float = 1.0 if start % 2 == 0 else -1.0
+        total: float = 0.0
+        for k in range(start, stop):
+            total += operation * 4.0 / (2 * k + 1)
+            operation *= -1
+        return total
+    sums: List[float] = []
+    for chunk_start in range(start, stop, chunk_size):
+        k: np.ndarray = np.arange(chunk_start, min(chunk_start + chunk_size, stop), dtype=np.float64)
+        terms: np.ndarray = 4.0 / (2.0 * k + 1.0)
+        terms[1 - chunk_start % 2::2] *= -1.0 # нечетные номера берем со знаком минус
+        sums.append(float(terms.sum()))
+    return fsum(sums)
+
+# векторизованный вариант calculate_pi
+def calculate_pi_vectorized(n_terms: int, chunk_size: int = CHUNK_SIZE) -> float:
+    return partial_sum(0, n_terms, chunk_size)
+
+# ряд делится на равные диапазоны, которые считаются в отдельных процессах
+def calculate_pi_parallel(n_terms: int, workers: Optional[int] = None) -> float:
+    workers = workers or cpu_count() or 1
+    bounds: List[int] = [n_terms * i // workers for i in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        sums: List[float] = list(executor.map(partial_sum, bounds[:-1], bounds[1:]))
+    return fsum(sums)
+
+# ускорение сходимости: частичные суммы знакопеременного ряда многократно
+# усредняются попарно (преобразование Эйлера), погрешность убывает геометрически
+# количество членов удваивается, пока два соседних приближения не совпадут с точностью tolerance
+def calculate_pi_accelerated(tolerance: float = 1e-12, max_terms: int = 1 << 12) -> float:
+    n_terms: int = 8
+    previous: Optional[float] = None
+    while True:
+        sums: List[float] = []
+        total: float = 0.0
+        for k in range(n_terms):
+            total += (4.0 if k % 2 == 0 else -4.0) / (2 * k + 1)
+            sums.append(total)
+        while len(sums) > 1:
+            sums = [(a + b) / 2 for a, b in zip(sums, sums[1:])]
+        if previous is not None and (abs(sums[0] - previous) < tolerance or n_terms >= max_terms):
+            return sums[0]
+        previous = sums[0]
+        n_terms *= 2
+
+
 if __name__ == '__main__':
-    print(calculate_pi(10000000))
\ No newline at end of file
+    from math import pi
+    from timeit import default_timer as timer
+    for name, method in (('loop', calculate_pi), ('vectorized', calculate_pi_vectorized),
+                         ('parallel', calculate_pi_parallel)):
+        start: float = timer()
+        result: float = method(10000000)
+        print('{:>11}: {} (error {:.1e}) in {:.3f}s'.format(name, result, abs(result - pi), timer() - start))
+    start = timer()
+    result = calculate_pi_accelerated(1e-7)
+    print('{:>11}: {} (error {:.1e}) in {:.3f}s'.format('accelerated', result, abs(result - pi), timer() - start))
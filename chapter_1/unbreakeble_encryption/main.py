@@ -1,5 +1,16 @@
+from concurrent.futures import ProcessPoolExecutor
+from mmap import mmap, ACCESS_READ, ACCESS_WRITE
+from os import cpu_count, path
 from secrets import token_bytes
-from typing import Tuple
+from typing import BinaryIO, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError: # numpy необязателен, без него XOR выполняется через большие целые
+    np = None
+
+Buffer = Union[bytes, bytearray, memoryview]
+CHUNK_SIZE: int = 1 << 20 # размер блока при потоковом шифровании
 
 def random_key(length: int) -> int:
     # генерировать length случайных байтов
@@ -7,21 +18,179 @@ def random_key(length: int) -> int:
     # преобразовать байты в битовую строку
     return int.from_bytes(tb, 'big')
 
+# длина в байтах не восстанавливается из bit_length (ведущие нулевые байты теряются),
+# поэтому зашифрованное число несет бит-маркер над старшим байтом, по которому decrypt узнает длину
+# для произвольных двоичных данных удобнее encrypt_bytes / decrypt_bytes
 def encrypt(original: str) -> Tuple[int, int]:
     original_bytes: bytes = original.encode()
     # набор случаных байтов должен быть такой же длины
     dummy: int = random_key(len(original_bytes))
     original_key: int = int.from_bytes(original_bytes, 'big')
-    encrypted: int = original_key ^ dummy # XOR
+    encrypted: int = original_key ^ dummy | (1 << 8 * len(original_bytes)) # XOR и маркер длины
     return dummy, encrypted
 
 def decrypt(key1: int, key2: int) -> str:
     decrypted: int = key1 ^ key2 # XOR
-    temp: bytes = decrypted.to_bytes(decrypted.bit_length() + 7 // 8, 'big')
+    length: int = (decrypted.bit_length() - 1) // 8
+    temp: bytes = (decrypted ^ (1 << 8 * length)).to_bytes(length, 'big')
     return temp.decode()
 
+# XOR двух буферов одинаковой длины с записью результата в out (bytearray, mmap, memoryview)
+# с numpy операция идет без промежуточных копий, без него - через большие целые
+def xor_into(data: Buffer, key: Buffer, out: Buffer) -> None:
+    if len(data) != len(key):
+        raise ValueError('Key length must match data length')
+    if np is not None:
+        np.bitwise_xor(np.frombuffer(data, dtype=np.uint8), np.frombuffer(key, dtype=np.uint8),
+                       out=np.frombuffer(out, dtype=np.uint8, count=len(data)))
+    else:
+        value: int = int.from_bytes(data, 'little') ^ int.from_bytes(key, 'little')
+        memoryview(out)[:len(data)] = value.to_bytes(len(data), 'little')
+
+def xor_bytes(data: Buffer, key: Buffer) -> bytes:
+    out: bytearray = bytearray(len(data))
+    xor_into(data, key, out)
+    return bytes(out)
+
+# шифрование байтов: возвращает ключ и зашифрованные данные
+def encrypt_bytes(original: Buffer) -> Tuple[bytes, bytes]:
+    dummy: bytes = token_bytes(len(original))
+    return dummy, xor_bytes(original, dummy)
+
+def decrypt_bytes(key: Buffer, encrypted: Buffer) -> bytes:
+    return xor_bytes(encrypted, key)
+
+# потоковый XOR: source и key - файлы, mmap или любые объекты с методом read
+# в памяти одновременно находится не больше одного блока каждого потока
+def xor_stream(source: BinaryIO, key: BinaryIO, target: BinaryIO, chunk_size: int = CHUNK_SIZE) -> int:
+    out: bytearray = bytearray(chunk_size)
+    total: int = 0
+    while True:
+        chunk: bytes = source.read(chunk_size)
+        if not chunk:
+            return total
+        key_chunk: bytes = key.read(len(chunk))
+        if len(key_chunk) != len(chunk):
+            raise ValueError('Key is shorter than data')
+        xor_into(chunk, key_chunk, out)
+        target.write(memoryview(out)[:len(chunk)])
+        total += len(chunk)
+
+# потоковое шифрование: ключ генерируется блоками через token_bytes
+# и записывается в key_target, зашифрованные данные - в target
+def encrypt_stream(source: BinaryIO, target: BinaryIO, key_target: BinaryIO, chunk_size: int = CHUNK_SIZE) -> int:
+    out: bytearray = bytearray(chunk_size)
+    total: int = 0
+    while True:
+        chunk: bytes = source.read(chunk_size)
+        if not chunk:
+            return total
+        dummy: bytes = token_bytes(len(chunk))
+        key_target.write(dummy)
+        xor_into(chunk, dummy, out)
+        target.write(memoryview(out)[:len(chunk)])
+        total += len(chunk)
+
+# расшифровка - тот же XOR с ключом
+def decrypt_stream(encrypted: BinaryIO, key: BinaryIO, target: BinaryIO, chunk_size: int = CHUNK_SIZE) -> int:
+    return xor_stream(encrypted, key, target, chunk_size)
+
+# XOR байтового диапазона [start, stop) файлов через mmap, выполняется в процессе пула
+# результат пишется прямо в отображение target, если generate_key - ключ
+# генерируется в этом же диапазоне файла key
+def _xor_range(source: str, key: str, target: str, start: int, stop: int,
+               chunk_size: int, generate_key: bool) -> None:
+    with open(source, 'rb') as source_file, open(key, 'r+b' if generate_key else 'rb') as key_file, \
+            open(target, 'r+b') as target_file:
+        with mmap(source_file.fileno(), 0, access=ACCESS_READ) as source_map, \
+                mmap(key_file.fileno(), 0, access=ACCESS_WRITE if generate_key else ACCESS_READ) as key_map, \
+                mmap(target_file.fileno(), 0, access=ACCESS_WRITE) as target_map:
+            with memoryview(source_map) as data, memoryview(key_map) as dummy, memoryview(target_map) as out:
+                for position in range(start, stop, chunk_size):
+                    end: int = min(position + chunk_size, stop)
+                    if generate_key:
+                        dummy[position:end] = token_bytes(end - position)
+                    xor_into(data[position:end], dummy[position:end], out[position:end])
+
+# указывают ли два пути на один и тот же файл (в том числе через ссылки)
+def _same_file(first: str, second: str) -> bool:
+    if path.realpath(first) == path.realpath(second):
+        return True
+    return path.exists(first) and path.exists(second) and path.samefile(first, second)
+
+# XOR файлов source и key в файл target, диапазоны байтов делятся между процессами
+# все проверки выполняются до того, как target (и генерируемый key) будут открыты на запись:
+# иначе ошибка оставила бы на месте существующего файла нули, а запись поверх source
+# уничтожила бы исходные данные
+def _xor_files_parallel(source: str, key: str, target: str, workers: Optional[int],
+                        chunk_size: int, generate_key: bool) -> int:
+    size: int = path.getsize(source)
+    if not generate_key and path.getsize(key) < size:
+        raise ValueError('Key is shorter than data')
+    if _same_file(source, target) or _same_file(source, key) or _same_file(key, target):
+        raise ValueError('Source, key and target must be different files')
+    files: List[str] = [target, key] if generate_key else [target]
+    for name in files:
+        with open(name, 'wb') as f:
+            f.truncate(size)
+    if size == 0:
+        return 0
+    workers = workers or cpu_count() or 1
+    bounds: List[int] = [size * i // workers for i in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_xor_range, source, key, target, bounds[i], bounds[i + 1], chunk_size, generate_key)
+                   for i in range(workers) if bounds[i] < bounds[i + 1]]
+        for future in futures:
+            future.result()
+    return size
+
+# параллельное шифрование файла: ключ записывается в файл key, результат - в target
+def encrypt_file_parallel(source: str, target: str, key: str, workers: Optional[int] = None,
+                          chunk_size: int = CHUNK_SIZE) -> int:
+    return _xor_files_parallel(source, key, target, workers, chunk_size, True)
+
+def decrypt_file_parallel(encrypted: str, key: str, target: str, workers: Optional[int] = None,
+                          chunk_size: int = CHUNK_SIZE) -> int:
+    return _xor_files_parallel(encrypted, key, target, workers, chunk_size, False)
+
+# пропускная способность расшифровки в ГБ/с для разного числа процессов
+def benchmark(size: int = 1 << 30, worker_counts: Optional[List[int]] = None) -> None:
+    from tempfile import TemporaryDirectory
+    from timeit import default_timer as timer
+    worker_counts = worker_counts or sorted({1, 2, 4, cpu_count() or 1})
+    with TemporaryDirectory() as directory:
+        plain: str = path.join(directory, 'plain')
+        encrypted: str = path.join(directory, 'encrypted')
+        key: str = path.join(directory, 'key')
+        decrypted: str = path.join(directory, 'decrypted')
+        with open(plain, 'wb') as f:
+            for _ in range(0, size, CHUNK_SIZE):
+                f.write(token_bytes(CHUNK_SIZE))
+            f.truncate(size)
+        encrypt_file_parallel(plain, encrypted, key)
+        for workers in worker_counts:
+            start: float = timer()
+            decrypt_file_parallel(encrypted, key, decrypted, workers)
+            elapsed: float = timer() - start
+            print('{:>3} workers: {:.2f} GB/s'.format(workers, size / elapsed / (1 << 30)))
+
 
 if __name__ == '__main__':
     key1, key2 = encrypt('Hello, friend!')
     result: str = decrypt(key1, key2)
     print(result)
+    from io import BytesIO
+    from timeit import default_timer as timer
+    data: bytes = token_bytes(1 << 26)
+    encrypted_file: BytesIO = BytesIO()
+    key_file: BytesIO = BytesIO()
+    encrypt_stream(BytesIO(data), encrypted_file, key_file)
+    decrypted_file: BytesIO = BytesIO()
+    encrypted_file.seek(0)
+    key_file.seek(0)
+    start: float = timer()
+    decrypt_stream(encrypted_file, key_file, decrypted_file)
+    elapsed: float = timer() - start
+    print('stream of {} MB: {:.0f} MB/s, same: {}'.format(len(data) >> 20, (len(data) >> 20) / elapsed,
+                                                           decrypted_file.getvalue() == data))
+    benchmark(1 << 28)
@@ -1,16 +1,184 @@
+from array import array
+from typing import BinaryIO, Dict, IO, Iterator, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError: # numpy необязателен, без него работают чистые Python-версии
+    np = None
+
+NUCLEOTIDES: bytes = b'ACGT'
+ITER_BLOCK: int = 4096 # сколько нуклеотидов распаковывать за раз при итерации
+CHUNK_SIZE: int = 1 << 20 # размер блока при потоковом чтении и записи
+_WHITESPACE: bytes = b' \t\r\n'
+KMER_WINDOW: int = 1 << 20 # сколько k-меров обрабатывать numpy за один проход
+
+# таблицы для пакетного сжатия: нуклеотид -> 2-битный код,
+# сразу сдвинутый на свою позицию внутри байта (4 нуклеотида на байт,
+# первый нуклеотид занимает старшие биты)
+_PACK_TABLES: List[bytes] = []
+for _shift in (6, 4, 2, 0):
+    _table = bytearray(256)
+    for _code, _nucleotide in enumerate(NUCLEOTIDES):
+        _table[_nucleotide] = _code << _shift
+    _PACK_TABLES.append(bytes(_table))
+
+# таблицы для пакетной распаковки: байт -> нуклеотид на позиции 0..3
+_UNPACK_TABLES: List[bytes] = [
+    bytes(NUCLEOTIDES[(b >> shift) & 0b11] for b in range(256)) for shift in (6, 4, 2, 0)
+]
+
+_NUCLEOTIDE_CODES: Dict[str, int] = {'A': 0b00, 'C': 0b01, 'G': 0b10, 'T': 0b11}
+
+# таблица для поэлементного разбора: байт -> 4 двухбитных кода
+_CODE_TABLE: List[Tuple[int, int, int, int]] = [
+    ((b >> 6) & 0b11, (b >> 4) & 0b11, (b >> 2) & 0b11, b & 0b11) for b in range(256)
+]
+
+
+# 2-битный код k-мера: первый нуклеотид в старших битах
+def kmer_code(kmer: str) -> int:
+    code: int = 0
+    for nucleotide in kmer.upper():
+        if nucleotide not in _NUCLEOTIDE_CODES:
+            raise ValueError('Invalid Nucleotide:{}'.format(nucleotide))
+        code = (code << 2) | _NUCLEOTIDE_CODES[nucleotide]
+    return code
+
+
+# обратное преобразование кода в строку длины k
+def code_to_kmer(code: int, k: int) -> str:
+    return ''.join(chr(NUCLEOTIDES[(code >> (2 * (k - 1 - i))) & 0b11]) for i in range(k))
+
+
+# упаковывает строку нуклеотидов в bytearray (4 нуклеотида на байт)
+def pack_nucleotides(gene: str) -> bytearray:
+    try:
+        raw: bytes = gene.encode('ascii')
+    except UnicodeEncodeError as e:
+        raise ValueError('Invalid Nucleotide:{}'.format(gene[e.start]))
+    return bytearray(_pack_bytes(raw))
+
+
+# упаковка ASCII-нуклеотидов
+# вся работа идет через bytes.translate и срезы с шагом, без цикла по символам
+def _pack_bytes(raw: bytes) -> bytes:
+    raw = raw.upper()
+    invalid: bytes = raw.translate(None, NUCLEOTIDES)
+    if invalid:
+        raise ValueError('Invalid Nucleotide:{}'.format(chr(invalid[0])))
+    # добиваем до кратного 4 количества нуклеотидов, хвост заполняется кодом A (00)
+    raw += b'A' * (-len(raw) % 4)
+    size: int = len(raw) // 4
+    # коды разных позиций не пересекаются по битам, поэтому их можно объединить
+    # одним OR над большими целыми без переносов между байтами
+    value: int = 0
+    for position, table in enumerate(_PACK_TABLES):
+        value |= int.from_bytes(raw[position::4].translate(table), 'big')
+    return value.to_bytes(size, 'big')
+
+
+# распаковывает первые length нуклеотидов из упакованных байтов
+def unpack_nucleotides(packed: Union[bytes, bytearray, memoryview], length: int) -> str:
+    source: bytes = packed.tobytes() if isinstance(packed, memoryview) else packed
+    out: bytearray = bytearray(len(source) * 4)
+    for position, table in enumerate(_UNPACK_TABLES):
+        out[position::4] = source.translate(table)
+    del out[length:]
+    return out.decode('ascii')
+
+
 # класс, представляющий сжатый ген
 # изначально ген представлен строкой типа "A" или "С и проч.
 # мы можем представить его последовательностью битов
+# packed=True включает хранение в bytearray (4 нуклеотида на байт),
+# которое сжимается и распаковывается за линейное время
 class CompressedGene:
-    def __init__(self, gene: str):
-        self._compress(gene)
+    def __init__(self, gene: str, packed: bool = False):
+        self.packed: bool = packed
+        if packed:
+            self.byte_string: bytearray = pack_nucleotides(gene)
+            self._length: int = len(gene)
+        else:
+            self._compress(gene)
+
+    # собирает объект в режиме packed из уже упакованных байтов
+    @classmethod
+    def _from_packed(cls, byte_string: bytearray, length: int) -> 'CompressedGene':
+        gene: CompressedGene = cls.__new__(cls)
+        gene.packed = True
+        gene.byte_string = byte_string
+        gene._length = length
+        return gene
+
+    # потоковое сжатие из файла или mmap (подойдет любой объект с методом read)
+    # строки-заголовки FASTA (начинаются с '>') и пробельные символы пропускаются,
+    # несколько записей склеиваются в один ген
+    # в памяти одновременно находится не больше одного блока исходных данных
+    @classmethod
+    def from_fasta(cls, source: IO, chunk_size: int = CHUNK_SIZE) -> 'CompressedGene':
+        byte_string: bytearray = bytearray()
+        length: int = 0
+        carry: bytes = b'' # хвост блока, не заполнивший целый байт
+        in_header: bool = False
+        while True:
+            chunk: Union[bytes, str] = source.read(chunk_size)
+            if not chunk:
+                break
+            if isinstance(chunk, str):
+                chunk = chunk.encode('ascii', 'replace')
+            segments: List[bytes] = [carry]
+            position: int = 0
+            while position < len(chunk):
+                if in_header:
+                    newline: int = chunk.find(b'\n', position)
+                    if newline == -1:
+                        break
+                    in_header = False
+                    position = newline + 1
+                else:
+                    header: int = chunk.find(b'>', position)
+                    if header == -1:
+                        segments.append(chunk[position:])
+                        break
+                    segments.append(chunk[position:header])
+                    in_header = True
+                    position = header + 1
+            pending: bytes = b''.join(segments).translate(None, _WHITESPACE)
+            full: int = len(pending) - len(pending) % 4
+            byte_string += _pack_bytes(pending[:full])
+            length += full
+            carry = pending[full:]
+        byte_string += _pack_bytes(carry)
+        return cls._from_packed(byte_string, length + len(carry))
+
+    # потоковая запись упакованного гена: 8 байтов длины и затем сами байты
+    def write_packed(self, target: BinaryIO, chunk_size: int = CHUNK_SIZE) -> None:
+        byte_string: bytearray = self._packed()
+        target.write(len(self).to_bytes(8, 'big'))
+        view: memoryview = memoryview(byte_string)
+        for start in range(0, len(view), chunk_size):
+            target.write(view[start:start + chunk_size])
+        view.release()
+
+    # чтение гена, записанного методом write_packed
+    @classmethod
+    def read_packed(cls, source: BinaryIO, chunk_size: int = CHUNK_SIZE) -> 'CompressedGene':
+        length: int = int.from_bytes(source.read(8), 'big')
+        size: int = (length + 3) // 4
+        byte_string: bytearray = bytearray()
+        while len(byte_string) < size:
+            chunk: bytes = source.read(min(chunk_size, size - len(byte_string)))
+            if not chunk:
+                raise ValueError('Packed gene is truncated')
+            byte_string += chunk
+        return cls._from_packed(byte_string, length)
 
     def _compress(self, gene: str) -> None:
         self.bit_string: int = 1 # начальная метка
         for nucleotide in gene.upper():
             # сдвигаем метку на два бита влево
             # таким образом справа появляются 00
-            self.bit_string <<= 2 
+            self.bit_string <<= 2
 
             # если нуклеотид А, то последние 00 меняем на 00 и так далее
             # оператор | - логическое ИЛИ, выберет любое значение отличное от нуля
@@ -26,6 +194,8 @@ class CompressedGene:
                 raise ValueError('Invalid Nucleotide:{}'.format(nucleotide))
 
     def decompress(self) -> str:
+        if self.packed:
+            return unpack_nucleotides(self.byte_string, self._length)
         gene: str = ''
         for i in range(0, self.bit_string.bit_length() - 1, 2):
             bits: int = self.bit_string >> i & 0b11
@@ -38,13 +208,175 @@ class CompressedGene:
             elif bits == 0b11: #T
                 gene += 'T'
             else:
-                raise ValueError('Invalid Nucleotide:{}'.format(gebe))
+                raise ValueError('Invalid Nucleotide:{}'.format(bits))
         return gene[::-1]
 
+    # упакованное представление для любого режима хранения:
+    # битовая строка без начальной метки совпадает с упакованными байтами,
+    # если дополнить ее справа до целого числа байтов
+    # в режиме int упакованная копия строится один раз и запоминается вместе с bit_string,
+    # по которой построена: если bit_string заменят, копия будет построена заново
+    def _packed(self) -> bytearray:
+        if self.packed:
+            return self.byte_string
+        cache: Optional[Tuple[int, bytearray]] = getattr(self, '_packed_cache', None)
+        if cache is not None and cache[0] is self.bit_string:
+            return cache[1]
+        length: int = (self.bit_string.bit_length() - 1) // 2
+        value: int = self.bit_string ^ (1 << (2 * length))
+        value <<= 2 * (-length % 4)
+        byte_string: bytearray = bytearray(value.to_bytes((length + 3) // 4, 'big'))
+        self._packed_cache: Tuple[int, bytearray] = (self.bit_string, byte_string)
+        return byte_string
+
+    # распаковывает только нуклеотиды из полуинтервала [start, stop), затрагивая лишь байты окна
+    # сдвиг битовой строки в режиме int копировал бы весь ген, поэтому при первом обращении
+    # строится упакованная копия (O(длины гена) один раз), дальше каждое чтение - O(окна)
+    def _decode(self, start: int, stop: int) -> str:
+        if start >= stop:
+            return ''
+        byte_string: bytearray = self._packed()
+        first: int = start // 4
+        last: int = (stop + 3) // 4
+        return unpack_nucleotides(byte_string[first:last], stop - first * 4)[start - first * 4:]
+
+    def __len__(self) -> int:
+        if self.packed:
+            return self._length
+        return (self.bit_string.bit_length() - 1) // 2
+
+    def __getitem__(self, index: Union[int, slice]) -> str:
+        if isinstance(index, slice):
+            positions: range = range(len(self))[index]
+            if not positions:
+                return ''
+            low: int = min(positions[0], positions[-1])
+            high: int = max(positions[0], positions[-1]) + 1
+            window: str = self._decode(low, high)
+            if positions.step == 1:
+                return window
+            return window[positions[0] - low::positions.step][:len(positions)]
+        length: int = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('CompressedGene index out of range')
+        return self._decode(index, index + 1)
+
+    # итерация распаковывает ген блоками фиксированного размера,
+    # поэтому полная распакованная копия в памяти не появляется
+    def __iter__(self) -> Iterator[str]:
+        length: int = len(self)
+        for start in range(0, length, ITER_BLOCK):
+            yield from self._decode(start, min(start + ITER_BLOCK, length))
+
+    # 2-битные коды нуклеотидов по порядку, прямо из упакованных байтов
+    def _codes(self) -> Iterator[int]:
+        byte_string: bytearray = self._packed()
+        remaining: int = len(self)
+        for byte in byte_string:
+            codes: Tuple[int, int, int, int] = _CODE_TABLE[byte]
+            if remaining < 4:
+                yield from codes[:remaining]
+                return
+            yield from codes
+            remaining -= 4
+
+    # numpy-массив кодов нуклеотидов из полуинтервала [start, stop)
+    def _codes_array(self, byte_string: bytearray, start: int, stop: int) -> 'np.ndarray':
+        first: int = start // 4
+        chunk: np.ndarray = np.frombuffer(byte_string, dtype=np.uint8, count=(stop + 3) // 4 - first, offset=first)
+        codes: np.ndarray = np.empty((len(chunk), 4), dtype=np.int64)
+        for position, shift in enumerate((6, 4, 2, 0)):
+            codes[:, position] = (chunk >> shift) & 0b11
+        return codes.ravel()[start - first * 4:stop - first * 4]
+
+    # коды всех k-меров, начинающихся в окнах по KMER_WINDOW позиций
+    # (только для numpy и k <= 31, чтобы код помещался в int64)
+    def _kmer_windows(self, k: int) -> Iterator[Tuple[int, 'np.ndarray']]:
+        byte_string: bytearray = self._packed()
+        total: int = len(self) - k + 1
+        for start in range(0, total, KMER_WINDOW):
+            stop: int = min(start + KMER_WINDOW, total)
+            codes: np.ndarray = self._codes_array(byte_string, start, stop + k - 1)
+            hashes: np.ndarray = np.zeros(stop - start, dtype=np.int64)
+            for j in range(k):
+                hashes <<= 2
+                hashes |= codes[j:j + stop - start]
+            yield start, hashes
+
+    # скользящий 2-битный хеш: код каждого k-мера и его начальная позиция
+    def _rolling_kmers(self, k: int) -> Iterator[Tuple[int, int]]:
+        mask: int = (1 << (2 * k)) - 1
+        value: int = 0
+        for index, code in enumerate(self._codes()):
+            value = ((value << 2) | code) & mask
+            if index >= k - 1:
+                yield index - k + 1, value
+
+    # частоты всех k-меров: элемент с индексом kmer_code(kmer) хранит число вхождений
+    def kmer_counts(self, k: int) -> array:
+        if k <= 0:
+            raise ValueError('k must be positive')
+        if np is not None and k <= 31:
+            totals: np.ndarray = np.zeros(4 ** k, dtype=np.uint64)
+            for _, hashes in self._kmer_windows(k):
+                if 4 ** k <= KMER_WINDOW:
+                    # bincount только до наибольшего кода окна, без дополнения до 4^k
+                    window_counts: np.ndarray = np.bincount(hashes)
+                    totals[:len(window_counts)] += window_counts.astype(np.uint64, copy=False)
+                else:
+                    # кодов больше, чем k-меров в окне: сортировка окна дешевле счетчиков на все коды
+                    values, numbers = np.unique(hashes, return_counts=True)
+                    totals[values] += numbers.astype(np.uint64, copy=False)
+            counts: array = array('Q')
+            counts.frombytes(totals.view(np.uint8))
+            return counts
+        counts = array('Q', bytes(8 * 4 ** k))
+        for _, value in self._rolling_kmers(k):
+            counts[value] += 1
+        return counts
+
+    # все позиции (включая перекрывающиеся) вхождения pattern в ген
+    def find(self, pattern: str) -> List[int]:
+        if not pattern:
+            raise ValueError('Pattern must not be empty')
+        k: int = len(pattern)
+        target: int = kmer_code(pattern)
+        if np is not None and k <= 31:
+            offsets: List[int] = []
+            for start, hashes in self._kmer_windows(k):
+                offsets.extend((np.flatnonzero(hashes == target) + start).tolist())
+            return offsets
+        return [index for index, value in self._rolling_kmers(k) if value == target]
+
     def __str__(self) -> str:
         return self.decompress()
 
 
+# сравнение исходной реализации на int и упакованной в bytearray
+def benchmark(sizes: List[int] = [10_000, 50_000, 100_000, 200_000]) -> None:
+    from random import choice
+    from timeit import default_timer as timer
+    for size in sizes:
+        gene: str = ''.join(choice('ACGT') for _ in range(size))
+        start: float = timer()
+        bits: CompressedGene = CompressedGene(gene)
+        bits_compress: float = timer() - start
+        start = timer()
+        bits_gene: str = bits.decompress()
+        bits_decompress: float = timer() - start
+        start = timer()
+        packed: CompressedGene = CompressedGene(gene, packed=True)
+        packed_compress: float = timer() - start
+        start = timer()
+        packed_gene: str = packed.decompress()
+        packed_decompress: float = timer() - start
+        print('{:>10} nucleotides: int {:.3f}s / {:.3f}s, bytearray {:.3f}s / {:.3f}s, same: {}'.format(
+            size, bits_compress, bits_decompress, packed_compress, packed_decompress,
+            bits_gene == packed_gene == gene and bits._packed() == packed.byte_string))
+
+
 if __name__ == '__main__':
     from sys import getsizeof
     original: str = 'TAGATACACTAGCCGATCGACCGACGTAGATACACTAGCCGATCGACCGACGTAGATACACTAGCCGATCGACCGACGTAGATACACTAGCCGATCGACCGACG' * 100
@@ -53,4 +385,10 @@ if __name__ == '__main__':
     print('compressed is {} bytes'.format(getsizeof(compressed.bit_string)))
     print('original and compressed are the same?: {}'.format(original == compressed.decompress()))
     percent = (getsizeof(compressed.bit_string) / getsizeof(original))*100
-    print('compression ratio is: {}%'.format(100 - percent))
\ No newline at end of file
+    print('compression ratio is: {}%'.format(100 - percent))
+    packed = CompressedGene(original, packed=True)
+    print('packed is {} bytes'.format(getsizeof(packed.byte_string)))
+    print('original and packed are the same?: {}'.format(original == packed.decompress()))
+    print('window [100:120] is {}'.format(packed[100:120]))
+    print('ACG occurs {} times, first at {}'.format(packed.kmer_counts(3)[kmer_code('ACG')], packed.find('ACG')[:5]))
+    benchmark()
@@ -1,8 +1,15 @@
+from array import array
 from enum import Enum
-from typing import List, NamedTuple, Callable, Optional
+from typing import Any, Dict, List, NamedTuple, Callable, Optional, Set, Tuple
 import random
+from weakref import WeakSet
 from math import sqrt
-from generic_search import dfs, bfs, astar, node_to_path, Node
+from generic_search import dfs, bfs, astar, bidirectional_bfs, bidirectional_astar, node_to_path, Node, SearchStats, search_tree, parallel_bfs, Memoized
+
+try:
+    import numpy as np
+except ImportError: # numpy необязателен, без него сетка заполняется и обходится без векторизации
+    np = None
 
 
 # одна конкретная ячейка лабиринта
@@ -13,13 +20,27 @@ class Cell(str, Enum):
     GOAL = 'G'
     PATH = '*'
 
+_EMPTY: int = ord(Cell.EMPTY.value)
+_BLOCKED: int = ord(Cell.BLOCKED.value)
+_START: int = ord(Cell.START.value)
+_GOAL: int = ord(Cell.GOAL.value)
+_PATH: int = ord(Cell.PATH.value)
+
 # координаты ячейки в лабиринте
 class MazeLocation(NamedTuple):
     row: int
     column: int
 
 
+# точка прыжка для Jump Point Search: клетка и направление (drow, dcolumn), которым в нее пришли
+class JumpPoint(NamedTuple):
+    location: MazeLocation
+    direction: Tuple[int, int]
+
+
 # лабиринт
+# сетка хранится одним bytearray по строкам: ячейка (row, column) - байт с индексом
+# row * columns + column, значение байта - символ Cell
 class Maze:
     def __init__(self, rows: int = 10, columns: int = 10, sparseness: float = 0.2,
                  start: MazeLocation = MazeLocation(0, 0), goal: MazeLocation = MazeLocation(9, 9)) -> None:
@@ -27,56 +48,390 @@ class Maze:
         self._columns: int = columns
         self.start: MazeLocation = start
         self.goal: MazeLocation = goal
+        # индекс компонент связности открытых клеток, строится при первом запросе
+        self._labels: Optional[array] = None
+        self._merged: Dict[int, int] = {} # объединения компонент после открытия клеток
+        # кеши successors, которые нужно сбрасывать при изменении сетки; ссылки слабые,
+        # чтобы брошенные вызывающим кодом кеши освобождались и не сбрасывались впустую
+        self._caches: 'WeakSet[Memoized]' = WeakSet()
+        # горизонтальные прыжки JPS по строкам: строка -> (прыжки вправо, прыжки влево),
+        # строятся при первом обращении и сбрасываются при изменении клеток строки и ее соседей
+        self._row_jumps: Dict[int, Tuple[array, array]] = {}
+        self._jumps_goal: MazeLocation = goal # цель, для которой построены прыжки
         # заполнение сетки пустыми ячейками
-        self._grid: List[List[Cell]] = [[Cell.EMPTY for c in range(columns)] for r in range(rows)]
+        self._grid: bytearray = bytearray(_EMPTY.to_bytes(1, 'big') * (rows * columns))
         # заполнение сетки заблокированными ячейками
         self._randomly_fill(rows, columns, sparseness)
         # заполнение начальной и конечной позиций в лабиринте
-        self._grid[start.row][start.column] = Cell.START
-        self._grid[goal.row][goal.column] = Cell.GOAL
+        self._grid[start.row * columns + start.column] = _START
+        self._grid[goal.row * columns + goal.column] = _GOAL
 
+    # с numpy случайные числа генерируются одним вызовом на всю сетку
+    # (генератор numpy получает зерно из random, поэтому random.seed по-прежнему работает),
+    # без numpy - случайными байтами, которые переводятся в ячейки таблицей
     def _randomly_fill(self, rows: int, columns: int, sparseness: float):
-        for row in range(rows):
-            for column in range(columns):
-                if random.uniform(0, 1.0) < sparseness:
-                    self._grid[row][column] = Cell.BLOCKED
+        size: int = rows * columns
+        if np is not None:
+            rng = np.random.default_rng(random.getrandbits(64))
+            cells: np.ndarray = np.frombuffer(self._grid, dtype=np.uint8)
+            cells[rng.random(size) < sparseness] = _BLOCKED
+            return
+        threshold: int = round(sparseness * 256)
+        table: bytes = bytes(_BLOCKED if b < threshold else _EMPTY for b in range(256))
+        # random.randbytes появился только в Python 3.9
+        noise: bytes = random.getrandbits(8 * size).to_bytes(size, 'little') if size else b''
+        self._grid[:] = noise.translate(table)
 
     def successors(self, ml: MazeLocation):
         locations: List[MazeLocation] = []
+        grid: bytearray = self._grid
+        row, column = ml
+        index: int = row * self._columns + column
 
         # проверяем ячейку сверху от текущей
-        if ml.row + 1 < self._rows and self._grid[ml.row + 1][ml.column] != Cell.BLOCKED:
-            locations.append(MazeLocation(ml.row + 1, ml.column))
+        if row + 1 < self._rows and grid[index + self._columns] != _BLOCKED:
+            locations.append(MazeLocation(row + 1, column))
 
         # проверяем ячейку снизу от текущей
-        if ml.row - 1 >= 0 and self._grid[ml.row - 1][ml.column] != Cell.BLOCKED:
-            locations.append(MazeLocation(ml.row - 1, ml.column))
+        if row - 1 >= 0 and grid[index - self._columns] != _BLOCKED:
+            locations.append(MazeLocation(row - 1, column))
 
         # проверяем ячейку справа от текущей
-        if ml.column + 1 < self._columns and self._grid[ml.row][ml.column + 1] != Cell.BLOCKED:
-            locations.append(MazeLocation(ml.row, ml.column + 1))
+        if column + 1 < self._columns and grid[index + 1] != _BLOCKED:
+            locations.append(MazeLocation(row, column + 1))
 
         # проверяем ячейку слева от текущей
-        if ml.column - 1 >= 0 and self._grid[ml.row][ml.column - 1] != Cell.BLOCKED:
-            locations.append(MazeLocation(ml.row, ml.column - 1))
+        if column - 1 >= 0 and grid[index - 1] != _BLOCKED:
+            locations.append(MazeLocation(row, column - 1))
 
         return locations # возвращаем все возможные ходы из текущей ячейки
 
     # разметка лабиринта для красивого вывода
     def mark(self, path: List[MazeLocation], clear: bool = False) -> None:
         for maze_location in path:
-            self._grid[maze_location.row][maze_location.column] = Cell.EMPTY if clear else Cell.PATH
-            self._grid[self.start.row][self.start.column] = Cell.START
-            self._grid[self.goal.row][self.goal.column] = Cell.GOAL
+            self._set(maze_location.row * self._columns + maze_location.column, _EMPTY if clear else _PATH)
+        self._set(self.start.row * self._columns + self.start.column, _START)
+        self._set(self.goal.row * self._columns + self.goal.column, _GOAL)
+
+    # слабые ссылки не сериализуются (лабиринт передается в процессы parallel_bfs),
+    # кеши в копию лабиринта не переносятся
+    def __getstate__(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = self.__dict__.copy()
+        del state['_caches']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._caches = WeakSet()
+
+    # successors с LRU-кешем: подходит для многих поисков по одному лабиринту,
+    # записи соседей измененной клетки сбрасываются автоматически
+    def memoized_successors(self, maxsize: int = 1 << 16) -> Memoized[MazeLocation, List[MazeLocation]]:
+        cache: Memoized[MazeLocation, List[MazeLocation]] = Memoized(self.successors, maxsize)
+        self._caches.add(cache)
+        return cache
+
+    # изменение одной клетки
+    def set_cell(self, ml: MazeLocation, cell: Cell) -> None:
+        self._set(ml.row * self._columns + ml.column, ord(cell.value))
+
+    # запись в сетку с поддержкой индекса компонент:
+    # открытая клетка сливает компоненты соседей, закрытая может разбить компоненту,
+    # поэтому индекс сбрасывается и будет перестроен при следующем запросе
+    def _set(self, index: int, value: int) -> None:
+        was_open: bool = self._grid[index] != _BLOCKED
+        self._grid[index] = value
+        if was_open == (value != _BLOCKED):
+            return
+        if self._row_jumps:
+            # вынужденные соседи зависят от соседних строк
+            row = index // self._columns
+            for stale_row in (row - 1, row, row + 1):
+                self._row_jumps.pop(stale_row, None)
+        if self._caches:
+            # проходимость клетки меняет successors только у нее самой и у ее соседей
+            row, column = divmod(index, self._columns)
+            stale: List[MazeLocation] = [MazeLocation(row, column), MazeLocation(row + 1, column),
+                                         MazeLocation(row - 1, column), MazeLocation(row, column + 1),
+                                         MazeLocation(row, column - 1)]
+            for cache in self._caches:
+                cache.invalidate(*stale)
+        if self._labels is None:
+            return
+        if was_open:
+            self._labels = None
+            return
+        roots: Set[int] = {self._component_root(self._labels[neighbour]) for neighbour in self._open_neighbours(index)}
+        label: int = min(roots, default=index)
+        for root in roots:
+            if root != label:
+                self._merged[root] = label
+        self._labels[index] = label
+
+    def _open_neighbours(self, index: int) -> List[int]:
+        row, column = divmod(index, self._columns)
+        return [neighbour_row * self._columns + neighbour_column
+                for neighbour_row, neighbour_column in ((row + 1, column), (row - 1, column), (row, column + 1), (row, column - 1))
+                if self._is_open(neighbour_row, neighbour_column)]
+
+    # корень компоненты с учетом слияний (со сжатием путей)
+    def _component_root(self, label: int) -> int:
+        root: int = label
+        while root in self._merged:
+            root = self._merged[root]
+        while label != root:
+            next_label: int = self._merged[label]
+            self._merged[label] = root
+            label = next_label
+        return root
+
+    # разметка компонент связности: метка клетки - наименьший индекс клетки ее компоненты, -1 - стена
+    # с numpy строки сжимаются в отрезки, которые собираются подвешиванием корней и сжатием указателей,
+    # без numpy - обходом из каждой непомеченной клетки
+    def _build_components(self) -> array:
+        size: int = self._rows * self._columns
+        columns: int = self._columns
+        self._merged = {}
+        if np is not None:
+            # отрезки подряд идущих открытых клеток строки заведомо связны и становятся одной вершиной;
+            # ребра - вертикальные касания отрезков соседних строк (по одному на каждое касание)
+            is_open: np.ndarray = (np.frombuffer(self._grid, dtype=np.uint8) != _BLOCKED).reshape(self._rows, columns)
+            run_starts: np.ndarray = is_open.copy()
+            run_starts[:, 1:] &= ~is_open[:, :-1]
+            run_starts = run_starts.ravel()
+            run_of: np.ndarray = np.cumsum(run_starts, dtype=np.int32) - 1 # номер отрезка открытой клетки
+            run_cells: np.ndarray = np.flatnonzero(run_starts).astype(np.int32) # первая клетка отрезка
+            if len(run_cells) == 0: # открытых клеток нет
+                return array('i', [-1]) * size
+            touching: np.ndarray = is_open[:-1] & is_open[1:]
+            first_touch: np.ndarray = touching.copy()
+            first_touch[:, 1:] &= ~touching[:, :-1]
+            edges: np.ndarray = np.flatnonzero(first_touch.ravel()).astype(np.int32)
+            u: np.ndarray = run_of[edges]
+            v: np.ndarray = run_of[edges + columns]
+            parent: np.ndarray = np.arange(len(run_cells), dtype=np.int32)
+            while len(u):
+                parent_u: np.ndarray = parent[u]
+                parent_v: np.ndarray = parent[v]
+                differ: np.ndarray = parent_u != parent_v
+                if not differ.any():
+                    break
+                # ребра внутри уже собранных компонент больше не нужны
+                u, v, parent_u, parent_v = u[differ], v[differ], parent_u[differ], parent_v[differ]
+                # больший корень подвешивается к меньшему (при повторах побеждает любой - это тоже
+                # корректное подвешивание), затем указатели сжимаются до корней
+                parent[np.maximum(parent_u, parent_v)] = np.minimum(parent_u, parent_v)
+                while True:
+                    grandparent: np.ndarray = parent[parent]
+                    if np.array_equal(grandparent, parent):
+                        break
+                    parent = grandparent
+            # корень - отрезок с наименьшим номером, его первая клетка - наименьшая клетка компоненты
+            labels: np.ndarray = np.where(is_open.ravel(), run_cells[parent][run_of], -1).astype(np.int32)
+            return array('i', labels.tobytes())
+        labels: array = array('i', [-1]) * size
+        grid: bytearray = self._grid
+        for origin in range(size):
+            if labels[origin] != -1 or grid[origin] == _BLOCKED:
+                continue
+            labels[origin] = origin
+            frontier: List[int] = [origin]
+            while frontier:
+                index: int = frontier.pop()
+                column: int = index % columns
+                for neighbour, valid in ((index + columns, index + columns < size), (index - columns, index >= columns),
+                                         (index + 1, column + 1 < columns), (index - 1, column > 0)):
+                    if valid and labels[neighbour] == -1 and grid[neighbour] != _BLOCKED:
+                        labels[neighbour] = origin
+                        frontier.append(neighbour)
+        return labels
+
+    # номер компоненты связности клетки, -1 для стены
+    def component(self, ml: MazeLocation) -> int:
+        if self._labels is None:
+            self._labels = self._build_components()
+        label: int = self._labels[ml.row * self._columns + ml.column]
+        return -1 if label == -1 else self._component_root(label)
+
+    # достижима ли goal из start - за O(1) после однократной разметки
+    def is_reachable(self, start: Optional[MazeLocation] = None, goal: Optional[MazeLocation] = None) -> bool:
+        label: int = self.component(start or self.start)
+        return label != -1 and label == self.component(goal or self.goal)
+
+    # поиск пути от start до goal; недостижимые цели отсекаются по индексу компонент,
+    # не запуская поиск
+    def solve(self, algorithm: str = 'astar', start: Optional[MazeLocation] = None,
+              goal: Optional[MazeLocation] = None) -> Optional[Node[MazeLocation]]:
+        start = start or self.start
+        goal = goal or self.goal
+        if not self.is_reachable(start, goal):
+            return None
+        goal_test: Callable[[MazeLocation], bool] = lambda ml: ml == goal
+        if algorithm == 'dfs':
+            return dfs(start, goal_test, self.successors)
+        if algorithm == 'bfs':
+            return bfs(start, goal_test, self.successors)
+        if algorithm == 'astar':
+            return astar(start, goal_test, self.successors, manhattan_distance(goal))
+        raise ValueError('Unknown search algorithm: {}'.format(algorithm))
+
+    # расстояния (в шагах) от source до всех ячеек, -1 - ячейка недостижима
+    # результат - плоский массив по строкам, как и сетка
+    # поиск в ширину идет целыми уровнями: фронт хранится массивом индексов ячеек
+    def distances(self, source: Optional[MazeLocation] = None) -> array:
+        source = source or self.start
+        size: int = self._rows * self._columns
+        origin: int = source.row * self._columns + source.column
+        if np is not None:
+            return array('i', self._distances_numpy(origin).tobytes())
+        result: array = array('i', [-1]) * size
+        result[origin] = 0
+        frontier: List[int] = [origin]
+        columns: int = self._columns
+        grid: bytearray = self._grid
+        level: int = 0
+        while frontier:
+            level += 1
+            next_frontier: List[int] = []
+            for index in frontier:
+                column: int = index % columns
+                for neighbour, valid in ((index + columns, index + columns < size), (index - columns, index >= columns),
+                                         (index + 1, column + 1 < columns), (index - 1, column > 0)):
+                    if valid and result[neighbour] == -1 and grid[neighbour] != _BLOCKED:
+                        result[neighbour] = level
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        return result
+
+    # сетка окружается рамкой из заблокированных ячеек, поэтому соседи
+    # считаются сдвигом индекса без проверок границ
+    def _distances_numpy(self, origin: int) -> 'np.ndarray':
+        width: int = self._columns + 2
+        unvisited: np.ndarray = np.zeros((self._rows + 2, width), dtype=bool)
+        unvisited[1:-1, 1:-1] = (np.frombuffer(self._grid, dtype=np.uint8) != _BLOCKED).reshape(self._rows, self._columns)
+        unvisited = unvisited.ravel()
+        result: np.ndarray = np.full(len(unvisited), -1, dtype=np.int32)
+        # owner помогает убрать повторы из фронта без сортировки:
+        # из нескольких записей одной ячейки выживает последняя
+        owner: np.ndarray = np.empty(len(unvisited), dtype=np.int64)
+        start: int = (origin // self._columns + 1) * width + origin % self._columns + 1
+        result[start] = 0
+        unvisited[start] = False
+        frontier: np.ndarray = np.array([start], dtype=np.int64)
+        level: int = 0
+        while len(frontier):
+            level += 1
+            neighbours: np.ndarray = np.concatenate((frontier + width, frontier - width, frontier + 1, frontier - 1))
+            neighbours = neighbours[unvisited[neighbours]]
+            owner[neighbours] = np.arange(len(neighbours))
+            frontier = neighbours[owner[neighbours] == np.arange(len(neighbours))]
+            unvisited[frontier] = False
+            result[frontier] = level
+        return result.reshape(self._rows + 2, width)[1:-1, 1:-1].ravel()
 
     def goal_test(self, ml: MazeLocation) -> bool:
         return ml == self.goal
 
+    def _is_open(self, row: int, column: int) -> bool:
+        return 0 <= row < self._rows and 0 <= column < self._columns \
+            and self._grid[row * self._columns + column] != _BLOCKED
+
+    # Jump Point Search для сетки с 4 соседями
+    # из всех кратчайших путей рассматриваются только канонические: вертикальный шаг
+    # делается как можно раньше, поэтому после горизонтального шага поворот нужен,
+    # только если клетка сзади по диагонали заблокирована (вынужденный сосед)
+    # горизонтальный прыжок идет до цели, стены или клетки с вынужденным соседом,
+    # вертикальный - до клетки, из которой горизонтальный прыжок находит точку прыжка
+    # горизонтальные прыжки заранее посчитаны по строкам (как в JPS+), поэтому каждый шаг
+    # вертикального прыжка - два обращения к таблице, а не два сканирования строки
+    def _jump(self, row: int, column: int, drow: int, dcolumn: int) -> Optional[MazeLocation]:
+        if drow == 0:
+            target: int = self._jumps(row)[0 if dcolumn == 1 else 1][column]
+            return MazeLocation(row, target) if target >= 0 else None
+        while True:
+            row += drow
+            if not self._is_open(row, column):
+                return None
+            if row == self.goal.row and column == self.goal.column:
+                return MazeLocation(row, column)
+            right, left = self._jumps(row)
+            if right[column] >= 0 or left[column] >= 0:
+                return MazeLocation(row, column)
+
+    # таблицы горизонтальных прыжков строки; при смене цели все таблицы устаревают
+    def _jumps(self, row: int) -> Tuple[array, array]:
+        if self._jumps_goal != self.goal:
+            self._row_jumps.clear()
+            self._jumps_goal = self.goal
+        jumps: Optional[Tuple[array, array]] = self._row_jumps.get(row)
+        if jumps is None:
+            jumps = self._row_jumps[row] = (self._scan_row(row, 1), self._scan_row(row, -1))
+        return jumps
+
+    # столбец точки горизонтального прыжка из каждой клетки строки в направлении dcolumn или -1:
+    # строка проходится один раз против направления, и прыжок из клетки продолжает прыжок из соседней
+    def _scan_row(self, row: int, dcolumn: int) -> array:
+        columns: int = self._columns
+        start: int = row * columns
+        current: bytes = bytes(self._grid[start:start + columns])
+        # соседние строки; за краем сетки - строка стен
+        walls: bytes = bytes([_BLOCKED]) * columns
+        above: bytes = bytes(self._grid[start - columns:start]) if row > 0 else walls
+        below: bytes = bytes(self._grid[start + columns:start + 2 * columns]) if row + 1 < self._rows else walls
+        goal_column: int = self.goal.column if self.goal.row == row else -1
+        jumps: array = array('l', [-1]) * columns
+        for column in (range(columns - 2, -1, -1) if dcolumn == 1 else range(1, columns)):
+            target: int = column + dcolumn
+            if current[target] == _BLOCKED:
+                continue
+            if target == goal_column or (above[target] != _BLOCKED and above[column] == _BLOCKED) \
+                    or (below[target] != _BLOCKED and below[column] == _BLOCKED):
+                jumps[column] = target
+            else:
+                jumps[column] = jumps[target]
+        return jumps
+
+    # потомки точки прыжка: направления обрезаются по правилам канонического порядка
+    def jump_successors(self, point: JumpPoint) -> List[JumpPoint]:
+        row, column = point.location
+        drow, dcolumn = point.direction
+        if drow == 0 and dcolumn == 0: # стартовая клетка
+            directions: List[Tuple[int, int]] = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+        elif drow == 0:
+            directions = [(0, dcolumn)] + [(side, 0) for side in (-1, 1)
+                                           if self._is_open(row + side, column)
+                                           and not self._is_open(row + side, column - dcolumn)]
+        else:
+            directions = [(drow, 0), (0, 1), (0, -1)]
+        points: List[JumpPoint] = []
+        for direction in directions:
+            location: Optional[MazeLocation] = self._jump(row, column, *direction)
+            if location is not None:
+                points.append(JumpPoint(location, direction))
+        return points
+
+    # A* по точкам прыжка; между ними пути прямые, поэтому стоимость шага - манхэттенское расстояние
+    # возвращает цепочку Node по всем клеткам пути, как обычный astar
+    # successors позволяет подменить jump_successors (например, для подсчета раскрытий)
+    def jps(self, successors: Optional[Callable[[JumpPoint], List[JumpPoint]]] = None) -> Optional[Node[MazeLocation]]:
+        distance: Callable[[MazeLocation], float] = manhattan_distance(self.goal)
+        solution: Optional[Node[JumpPoint]] = astar(
+            JumpPoint(self.start, (0, 0)), lambda point: point.location == self.goal,
+            successors or self.jump_successors, lambda point: distance(point.location),
+            lambda a, b: abs(a.location.row - b.location.row) + abs(a.location.column - b.location.column))
+        if solution is None:
+            return None
+        points: List[JumpPoint] = node_to_path(solution)
+        node: Node[MazeLocation] = Node(points[0].location, None)
+        for point in points[1:]:
+            drow, dcolumn = point.direction
+            while node.state != point.location:
+                node = Node(MazeLocation(node.state.row + drow, node.state.column + dcolumn), node, node.cost + 1)
+        return node
+
     def __str__(self) -> str:
-        output: str = ''
-        for row in self._grid:
-            output += ''.join([c.value for c in row]) + '\n'
-        return output
+        text: str = self._grid.decode('ascii')
+        return ''.join(text[row * self._columns:(row + 1) * self._columns] + '\n' for row in range(self._rows))
 
 # возвращает функцию вычисляющую расстояние по прямой до цели
 def euclidean_distance(goal: MazeLocation) -> Callable[[MazeLocation], float]:
@@ -94,6 +449,129 @@ def manhattan_distance(goal: MazeLocation) -> Callable[[MazeLocation], float]:
         return (xdist + ydist)
     return distance
 
+# число раскрытых узлов (вызовов successors) и длина пути для каждого поиска
+# на больших случайных лабиринтах с фиксированным зерном
+def benchmark(sizes: List[Tuple[int, int]] = [(100, 100), (300, 300)],
+              sparseness_levels: List[float] = [0.0, 0.1, 0.2], seed: int = 1) -> None:
+    from timeit import default_timer as timer
+    random.seed(seed)
+    for (rows, columns), sparseness in [(size, level) for size in sizes for level in sparseness_levels]:
+        m: Maze = Maze(rows, columns, sparseness, MazeLocation(0, 0), MazeLocation(rows - 1, columns - 1))
+        searches = [
+            ('bfs', lambda successors: bfs(m.start, m.goal_test, successors)),
+            ('astar euclidean', lambda successors: astar(m.start, m.goal_test, successors, euclidean_distance(m.goal))),
+            ('astar manhattan', lambda successors: astar(m.start, m.goal_test, successors, manhattan_distance(m.goal))),
+            ('bidirectional bfs', lambda successors: bidirectional_bfs(m.start, m.goal, successors)),
+            ('bidirectional a*', lambda successors: bidirectional_astar(m.start, m.goal, successors,
+                                                                        manhattan_distance(m.goal),
+                                                                        manhattan_distance(m.start))),
+        ]
+        for name, search in searches:
+            expanded: List[int] = [0]
+            def counting_successors(ml: MazeLocation) -> List[MazeLocation]:
+                expanded[0] += 1
+                return m.successors(ml)
+            start: float = timer()
+            solution: Optional[Node[MazeLocation]] = search(counting_successors)
+            elapsed: float = timer() - start
+            length: int = len(node_to_path(solution)) if solution is not None else 0
+            print('{}x{} ({}) {:>17}: {:>8} expanded, path {:>5}, {:.3f}s'.format(
+                rows, columns, sparseness, name, expanded[0], length, elapsed))
+
+# сравнение Jump Point Search с bfs и astar: раскрытые узлы и сгенерированные потомки
+# (число потомков - верхняя граница операций с кучей/очередью)
+def benchmark_jps(sizes: List[Tuple[int, int]] = [(100, 100), (300, 300)],
+                  sparseness_levels: List[float] = [0.0, 0.05, 0.2], seed: int = 1) -> None:
+    from timeit import default_timer as timer
+    random.seed(seed)
+    for (rows, columns), sparseness in [(size, level) for size in sizes for level in sparseness_levels]:
+        m: Maze = Maze(rows, columns, sparseness, MazeLocation(0, 0), MazeLocation(rows - 1, columns - 1))
+        counters: List[int] = [0, 0]
+        def counting(successors: Callable[[Any], List[Any]]) -> Callable[[Any], List[Any]]:
+            def wrapper(state: Any) -> List[Any]:
+                children: List[Any] = successors(state)
+                counters[0] += 1
+                counters[1] += len(children)
+                return children
+            return wrapper
+        searches = [
+            ('bfs', lambda: bfs(m.start, m.goal_test, counting(m.successors))),
+            ('astar', lambda: astar(m.start, m.goal_test, counting(m.successors), manhattan_distance(m.goal))),
+            ('jps', lambda: m.jps(counting(m.jump_successors))),
+            # повторный поиск по тем же таблицам горизонтальных прыжков
+            ('jps (warm)', lambda: m.jps(counting(m.jump_successors))),
+        ]
+        for name, search in searches:
+            counters[:] = [0, 0]
+            start: float = timer()
+            solution: Optional[Node[MazeLocation]] = search()
+            elapsed: float = timer() - start
+            length: int = len(node_to_path(solution)) if solution is not None else 0
+            print('{}x{} ({}) {:>10}: {:>8} expanded, {:>8} generated, path {:>5}, {:.3f}s'.format(
+                rows, columns, sparseness, name, counters[0], counters[1], length, elapsed))
+
+# время генерации больших лабиринтов и построения поля расстояний
+def benchmark_distances(sizes: List[Tuple[int, int]] = [(1000, 1000), (4000, 4000)],
+                        sparseness: float = 0.2, seed: int = 1) -> None:
+    from timeit import default_timer as timer
+    random.seed(seed)
+    for rows, columns in sizes:
+        start: float = timer()
+        m: Maze = Maze(rows, columns, sparseness, MazeLocation(0, 0), MazeLocation(rows - 1, columns - 1))
+        generated: float = timer() - start
+        start = timer()
+        field: array = m.distances()
+        elapsed: float = timer() - start
+        print('{}x{}: generated in {:.3f}s, distance field in {:.3f}s, goal distance {}'.format(
+            rows, columns, generated, elapsed, field[-1]))
+
+# пути от одного старта до многих целей: отдельный bfs на каждую цель против одного search_tree
+def benchmark_search_tree(size: int = 200, goals: int = 50, sparseness: float = 0.2, seed: int = 1) -> None:
+    from timeit import default_timer as timer
+    random.seed(seed)
+    m: Maze = Maze(size, size, sparseness, MazeLocation(0, 0), MazeLocation(size - 1, size - 1))
+    targets: List[MazeLocation] = [MazeLocation(random.randrange(size), random.randrange(size)) for _ in range(goals)]
+    start: float = timer()
+    for target in targets:
+        bfs(m.start, lambda ml: ml == target, m.successors)
+    separate: float = timer() - start
+    start = timer()
+    tree = search_tree(m.start, m.successors, targets)
+    paths: List[Optional[List[MazeLocation]]] = [tree.path(target) for target in targets]
+    single: float = timer() - start
+    print('{}x{}, {} goals ({} reachable): {:.3f}s with bfs per goal, {:.3f}s with one search_tree'.format(
+        size, size, goals, sum(path is not None for path in paths), separate, single))
+
+# successors с искусственной нагрузкой (имитация дорогой функции переходов);
+# класс модуля, а не замыкание, чтобы его можно было передать в процессы
+class _SlowSuccessors:
+    def __init__(self, maze: Maze, work: int) -> None:
+        self.maze: Maze = maze
+        self.work: int = work
+
+    def __call__(self, ml: MazeLocation) -> List[MazeLocation]:
+        total: int = 0
+        for i in range(self.work):
+            total += i * i
+        return self.maze.successors(ml)
+
+# bfs против parallel_bfs на дорогих successors
+def benchmark_parallel_bfs(size: int = 100, work: int = 5_000, workers: Optional[int] = None,
+                           sparseness: float = 0.2, seed: int = 1) -> None:
+    from timeit import default_timer as timer
+    random.seed(seed)
+    m: Maze = Maze(size, size, sparseness, MazeLocation(0, 0), MazeLocation(size - 1, size - 1))
+    successors: _SlowSuccessors = _SlowSuccessors(m, work)
+    start: float = timer()
+    serial: Optional[Node[MazeLocation]] = bfs(m.start, m.goal_test, successors)
+    serial_time: float = timer() - start
+    start = timer()
+    parallel: Optional[Node[MazeLocation]] = parallel_bfs(m.start, m.goal_test, successors, workers=workers)
+    parallel_time: float = timer() - start
+    same: bool = (serial is None and parallel is None) or (serial is not None and parallel is not None
+                                                          and node_to_path(serial) == node_to_path(parallel))
+    print('{}x{}: bfs {:.3f}s, parallel_bfs {:.3f}s, same path: {}'.format(size, size, serial_time, parallel_time, same))
+
 # тестирование лабиринта
 if __name__ == '__main__':
     # DFS
@@ -125,7 +603,8 @@ if __name__ == '__main__':
 
     # Тестирование A*
     distance: Callable[[MazeLocation], float] = manhattan_distance(m.goal)
-    solution3: Optional[Node[MazeLocation]] = astar(m.start, m.goal_test, m.successors, distance)
+    stats: SearchStats = SearchStats(depth_histogram=True)
+    solution3: Optional[Node[MazeLocation]] = astar(m.start, m.goal_test, m.successors, distance, stats=stats)
     if solution3 is None:
         print('No solution found using A*!')
     else:
@@ -133,4 +612,5 @@ if __name__ == '__main__':
         m.mark(path3)
         print('===== A* ======')
         print(m)
+        print(stats)
         m.mark(path3, clear=True)
\ No newline at end of file
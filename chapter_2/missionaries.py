@@ -1,60 +1,125 @@
 from __future__ import annotations
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from generic_search import bfs, Node, node_to_path
 
 MAX_NUM: int = 3
+BOAT_CAPACITY: int = 2
+
+# возможные составы лодки (миссионеры, каннибалы): от 1 до capacity человек,
+# в самой лодке миссионеров тоже нельзя оставлять в меньшинстве
+@lru_cache(maxsize=None)
+def boat_moves(capacity: int) -> Tuple[Tuple[int, int], ...]:
+    return tuple((m, c) for m in range(capacity + 1) for c in range(capacity + 1 - m)
+                 if m + c > 0 and (m == 0 or m >= c))
+
+# параметры задачи (миссионеры, каннибалы, вместимость лодки) хранятся в одном кортеже на задачу,
+# который разделяют все ее состояния
+_puzzles: Dict[Tuple[int, int, int], Tuple[int, int, int]] = {}
+
+# никто из миссионеров ни на одном берегу не остается в меньшинстве
+def _legal(wm: int, wc: int, max_missionaries: int, max_cannibals: int) -> bool:
+    em: int = max_missionaries - wm
+    ec: int = max_cannibals - wc
+    return not (0 < wm < wc) and not (0 < em < ec)
 
 class MCState:
-    def __init__(self, missionaries: int, cannibals: int, boat: bool) -> None:
-        self.wm: int = missionaries # миссионеры с западного берега
-        self.wc: int = cannibals # каннибалы с западного берега
-        self.em: int = MAX_NUM - self.wm # миссионеры на восточном берегу
-        self.ec: int = MAX_NUM - self.wc # каннибалы на восточном берегу
-        self.boat: bool = boat
+    # __slots__ вместо __dict__ и одно число-ключ для хеширования и сравнения:
+    # без __eq__/__hash__ множество explored в bfs не распознавало повторные состояния
+    # в состоянии хранятся только ключ и общий кортеж параметров задачи,
+    # численность людей на берегах и положение лодки вычисляются из ключа
+    __slots__ = ('_key', 'puzzle')
+
+    def __init__(self, missionaries: int, cannibals: int, boat: bool, max_missionaries: int = MAX_NUM,
+                 max_cannibals: int = MAX_NUM, capacity: int = BOAT_CAPACITY) -> None:
+        puzzle: Tuple[int, int, int] = (max_missionaries, max_cannibals, capacity)
+        self.puzzle: Tuple[int, int, int] = _puzzles.setdefault(puzzle, puzzle) # параметры задачи
+        self._key: int = (missionaries * (max_cannibals + 1) + cannibals) * 2 + boat
+
+    # собирает состояние из готового ключа, без поиска параметров задачи в _puzzles
+    @classmethod
+    def _from_key(cls, key: int, puzzle: Tuple[int, int, int]) -> MCState:
+        state: MCState = cls.__new__(cls)
+        state._key = key
+        state.puzzle = puzzle
+        return state
+
+    @property
+    def wm(self) -> int: # миссионеры с западного берега
+        return (self._key >> 1) // (self.puzzle[1] + 1)
+
+    @property
+    def wc(self) -> int: # каннибалы с западного берега
+        return (self._key >> 1) % (self.puzzle[1] + 1)
+
+    @property
+    def em(self) -> int: # миссионеры на восточном берегу
+        return self.puzzle[0] - self.wm
+
+    @property
+    def ec(self) -> int: # каннибалы на восточном берегу
+        return self.puzzle[1] - self.wc
+
+    @property
+    def boat(self) -> bool:
+        return bool(self._key & 1)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, MCState):
+            return NotImplemented
+        return self._key == other._key and self.puzzle == other.puzzle
+
+    def __hash__(self) -> int:
+        return self._key
 
     @property
     def is_legal(self) -> bool:
-        if self.wm < self.wc and self.wm > 0:
-            return False
-        if self.em < self.ec and self.em > 0:
-            return False
-        return True
+        max_missionaries, max_cannibals, _ = self.puzzle
+        wm, wc = divmod(self._key >> 1, max_cannibals + 1)
+        return _legal(wm, wc, max_missionaries, max_cannibals)
 
     def successors(self) -> List[MCState]:
+        puzzle: Tuple[int, int, int] = self.puzzle
+        max_missionaries, max_cannibals, capacity = puzzle
+        wm, wc = divmod(self._key >> 1, max_cannibals + 1)
+        boat: int = self._key & 1
+        # лодка на западном берегу - люди уходят с запада, иначе - возвращаются на запад
+        direction: int = -1 if boat else 1
+        available_missionaries: int = wm if boat else max_missionaries - wm
+        available_cannibals: int = wc if boat else max_cannibals - wc
         sucs: List[MCState] = []
-        if self.boat: # лодка на западном берегу
-            if self.wm > 1:
-                sucs.append(MCState(self.wm - 2, self.wc, not self.boat))
-            if self.wm > 0:
-                sucs.append(MCState(self.wm - 1, self.wc, not self.boat))
-            if self.wc > 1:
-                sucs.append(MCState(self.wm, self.wc - 2, not self.boat))
-            if self.wc > 0:
-                sucs.append(MCState(self.wm, self.wc - 1, not self.boat))
-            if (self.wc > 0) and (self.wm > 0):
-                sucs.append(MCState(self.wm - 1, self.wc - 1, not self.boat))
-        else: # лодка на восточном берегу
-            if self.em > 1:
-                sucs.append(MCState(self.wm + 2, self.wc, not self.boat))
-            if self.em > 0:
-                sucs.append(MCState(self.wm + 1, self.wc, not self.boat))
-            if self.ec > 1:
-                sucs.append(MCState(self.wm, self.wc + 2, not self.boat))
-            if self.ec > 0:
-                sucs.append(MCState(self.wm, self.wc + 1, not self.boat))
-            if (self.ec > 0) and (self.em > 0):
-                sucs.append(MCState(self.wm + 1, self.wc + 1, not self.boat))
-        return [x for x in sucs if x.is_legal]
+        for m, c in boat_moves(capacity):
+            if m <= available_missionaries and c <= available_cannibals:
+                missionaries: int = wm + direction * m
+                cannibals: int = wc + direction * c
+                if _legal(missionaries, cannibals, max_missionaries, max_cannibals):
+                    sucs.append(MCState._from_key((missionaries * (max_cannibals + 1) + cannibals) * 2 + 1 - boat,
+                                                  puzzle))
+        return sucs
 
     # проверяем является ли состояние разрешенным
     def goal_test(self) -> bool:
-        return self.is_legal and self.em == MAX_NUM and self.ec == MAX_NUM
+        return self.is_legal and self.wm == 0 and self.wc == 0
 
     def __str__(self) -> str:
         return ('On the west bank there are {} missionaries and {} cannibals.\n'
             'On the east bank there are {} missionaries and {} cannibals.\n'
             'The boat on the {} bank.').format(self.wm, self.wc, self.em, self.ec, ('west' if self.boat else 'east'))
 
+# таблица переходов для всех разрешенных состояний задачи, строится один раз;
+# возвращает функцию successors для bfs, которая лишь достает готовый список
+def successor_table(max_missionaries: int = MAX_NUM, max_cannibals: int = MAX_NUM,
+                    capacity: int = BOAT_CAPACITY) -> Callable[[MCState], List[MCState]]:
+    table: Dict[MCState, List[MCState]] = {}
+    for missionaries in range(max_missionaries + 1):
+        for cannibals in range(max_cannibals + 1):
+            for boat in (True, False):
+                state: MCState = MCState(missionaries, cannibals, boat, max_missionaries, max_cannibals, capacity)
+                if state.is_legal:
+                    table[state] = state.successors()
+    empty: List[MCState] = []
+    return lambda state: table.get(state, empty)
+
 def display_solution(path: List[MCState]):
     if len(path) == 0:
         return
@@ -78,4 +143,10 @@ if __name__ == '__main__':
         print('No solution found!')
     else:
         path: List[MCState] = node_to_path(solution)
-        display_solution(path)
\ No newline at end of file
+        display_solution(path)
+
+    # большая задача: 300 миссионеров, 300 каннибалов, лодка на 4 человека
+    big_start: MCState = MCState(300, 300, True, 300, 300, 4)
+    big_solution: Optional[Node[MCState]] = bfs(big_start, MCState.goal_test, successor_table(300, 300, 4))
+    print('300 + 300, boat for 4: {} crossings'.format(
+        'no solution' if big_solution is None else len(node_to_path(big_solution)) - 1))
@@ -1,14 +1,28 @@
+from array import array
 from enum import IntEnum
-from typing import Tuple, List
+from itertools import accumulate
+from typing import Iterable, Tuple, List, Union
+
+try:
+    import numpy as np
+except ImportError: # numpy необязателен, без него работают чистые Python-версии
+    np = None
 
 
 # поиск в гене определенного кодона
 Nucleotide: IntEnum = IntEnum('Nucleotide', ('A', 'C', 'G', 'T'))
 Codon = Tuple[Nucleotide, Nucleotide, Nucleotide]
 Gene = List[Codon]
+CodonKey = Union[Codon, int] # кодон или его 6-битный код
+
+CODON_COUNT: int = 64 # 4 ** 3 различных кодонов
 
 gene_str: str = 'ACGTCGAGCTCGGCCCGATCGGCAGCGGCTCCTAGCCGCTCGCGAGCGCTCGCAGCGCTACGCTACGACGCTCCC'
 
+NUCLEOTIDES: bytes = b'ACGT'
+# таблица для bytes.translate: буква нуклеотида -> 2-битный код (остальные байты отсекаются до перевода)
+_NUCLEOTIDE_TABLE: bytes = bytes(max(NUCLEOTIDES.find(bytes([b])), 0) for b in range(256))
+
 def str_to_gene(s: str) -> Gene:
     gene: Gene = []
     for i in range(0, len(s), 3):
@@ -27,7 +41,7 @@ def linear_contains(gene: Gene, key_codon: Codon) -> bool:
             return True
     return False
 
-# бинарный поиск
+# бинарный поиск, gene должен быть отсортирован (например, sorted(my_gene))
 def binary_contains(gene: Gene, key_codon: Codon) -> bool:
     low: int = 0
     high: int = len(gene) - 1
@@ -41,3 +55,140 @@ def binary_contains(gene: Gene, key_codon: Codon) -> bool:
             return True
     return False
 
+
+# 6-битный код кодона: первый нуклеотид в старших битах,
+# поэтому порядок кодов совпадает с порядком кортежей Codon
+# готовый код проверяется: отрицательный или слишком большой молча выбрал бы чужой элемент таблицы
+def codon_code(codon: CodonKey) -> int:
+    if isinstance(codon, int):
+        if not 0 <= codon < CODON_COUNT:
+            raise ValueError('Invalid codon code:{}'.format(codon))
+        return codon
+    return ((codon[0] - 1) << 4) | ((codon[1] - 1) << 2) | (codon[2] - 1)
+
+def code_to_codon(code: int) -> Codon:
+    return (Nucleotide((code >> 4) + 1), Nucleotide(((code >> 2) & 0b11) + 1), Nucleotide((code & 0b11) + 1))
+
+# компактное представление гена: по байту на кодон
+def gene_to_codes(gene: Gene) -> array:
+    return array('B', [codon_code(codon) for codon in gene])
+
+# то же прямо из строки, без промежуточных кортежей; неполный последний кодон отбрасывается
+def str_to_codes(s: str) -> array:
+    raw: bytes = s.encode('ascii').upper()
+    invalid: bytes = raw.translate(None, NUCLEOTIDES)
+    if invalid:
+        raise ValueError('Invalid Nucleotide:{}'.format(chr(invalid[0])))
+    nucleotides: bytes = raw.translate(_NUCLEOTIDE_TABLE)
+    length: int = len(nucleotides) // 3 * 3
+    if np is not None:
+        values: np.ndarray = np.frombuffer(nucleotides, dtype=np.uint8, count=length).reshape(-1, 3)
+        return array('B', (values[:, 0] << 4 | values[:, 1] << 2 | values[:, 2]).astype(np.uint8).tobytes())
+    return array('B', [first << 4 | second << 2 | third for first, second, third in
+                       zip(nucleotides[0:length:3], nucleotides[1:length:3], nucleotides[2:length:3])])
+
+
+# индекс гена: для каждого кодона - отсортированный список его позиций (номеров кодонов в гене)
+# строится один раз сортировкой подсчетом, после чего принадлежность и количество - O(1),
+# а позиции - срез общего массива без копирования списков
+class CodonIndex:
+    def __init__(self, codes: Union[array, Gene, str]) -> None:
+        if isinstance(codes, str):
+            codes = str_to_codes(codes)
+        elif not isinstance(codes, array):
+            codes = gene_to_codes(codes)
+        self.codes: array = codes
+        if np is not None:
+            values: np.ndarray = np.frombuffer(codes, dtype=np.uint8)
+            counts: List[int] = np.bincount(values, minlength=CODON_COUNT).tolist()
+            self._order: array = array('I', np.argsort(values, kind='stable').astype(np.uint32).tobytes())
+        else:
+            counts = [0] * CODON_COUNT
+            for code in codes:
+                counts[code] += 1
+        # starts[c]:starts[c + 1] - позиции кодона c в self._order
+        self._starts: List[int] = [0] + list(accumulate(counts))
+        self._counts: List[int] = counts
+        if np is None:
+            fill: List[int] = self._starts[:-1]
+            order: array = array('I', bytes(4 * len(codes)))
+            for position, code in enumerate(codes):
+                order[fill[code]] = position
+                fill[code] += 1
+            self._order = order
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, codon: CodonKey) -> bool:
+        return self._counts[codon_code(codon)] > 0
+
+    def count(self, codon: CodonKey) -> int:
+        return self._counts[codon_code(codon)]
+
+    # позиции кодона в гене по возрастанию (номер кодона; позиция в строке - умножить на 3)
+    def offsets(self, codon: CodonKey) -> array:
+        code: int = codon_code(codon)
+        return self._order[self._starts[code]:self._starts[code + 1]]
+
+    # пакетные запросы: с numpy - одна векторная выборка по таблице из 64 значений
+    # codons - последовательность кодонов, их кодов или numpy-массив кодов
+    def contains_many(self, codons: Iterable[CodonKey]) -> Union[List[bool], 'np.ndarray']:
+        if np is not None:
+            return np.asarray(self._counts)[self._query_codes(codons)] > 0
+        counts: List[int] = self._counts
+        return [counts[codon_code(codon)] > 0 for codon in codons]
+
+    def count_many(self, codons: Iterable[CodonKey]) -> Union[List[int], 'np.ndarray']:
+        if np is not None:
+            return np.asarray(self._counts)[self._query_codes(codons)]
+        counts: List[int] = self._counts
+        return [counts[codon_code(codon)] for codon in codons]
+
+    # массив кодов проверяется целиком по минимуму и максимуму, а не поэлементно
+    def _query_codes(self, codons: Iterable[CodonKey]) -> 'np.ndarray':
+        if isinstance(codons, np.ndarray):
+            if codons.dtype.kind not in 'iu':
+                raise ValueError('Codon codes must be integers')
+            if len(codons) > 0 and (codons.min() < 0 or codons.max() >= CODON_COUNT):
+                bad: int = int(codons[(codons < 0) | (codons >= CODON_COUNT)][0])
+                raise ValueError('Invalid codon code:{}'.format(bad))
+            return codons.astype(np.intp, copy=False)
+        return np.fromiter((codon_code(codon) for codon in codons), dtype=np.intp)
+
+
+# сравнение поиска по списку кортежей с индексом на одиночных и пакетных запросах
+def benchmark(length: int = 1_000_000, queries: int = 10_000, seed: int = 1) -> None:
+    from timeit import default_timer as timer
+    import random
+    random.seed(seed)
+    s: str = ''.join(random.choice('ACGT') for _ in range(length * 3))
+    keys: List[Codon] = [code_to_codon(random.randrange(CODON_COUNT)) for _ in range(queries)]
+    gene: Gene = str_to_gene(s)
+    start: float = timer()
+    sorted_gene: Gene = sorted(gene)
+    found: int = sum(binary_contains(sorted_gene, key) for key in keys)
+    print('sorted + binary_contains: {:.3f}s ({} found)'.format(timer() - start, found))
+    start = timer()
+    index: CodonIndex = CodonIndex(s)
+    built: float = timer() - start
+    start = timer()
+    found = sum(key in index for key in keys)
+    single: float = timer() - start
+    start = timer()
+    found_bulk: int = int(sum(index.contains_many(keys)))
+    print('CodonIndex: built in {:.3f}s, {} single queries in {:.4f}s, bulk in {:.4f}s ({} / {} found)'.format(
+        built, queries, single, timer() - start, found, found_bulk))
+
+
+if __name__ == '__main__':
+    acg: Codon = (Nucleotide.A, Nucleotide.C, Nucleotide.G)
+    gat: Codon = (Nucleotide.G, Nucleotide.A, Nucleotide.T)
+    print(linear_contains(my_gene, acg)) # True
+    print(linear_contains(my_gene, gat)) # False
+    sorted_gene: Gene = sorted(my_gene)
+    print(binary_contains(sorted_gene, acg)) # True
+    print(binary_contains(sorted_gene, gat)) # False
+    index: CodonIndex = CodonIndex(gene_str)
+    print(acg in index, index.count(acg), index.offsets(acg).tolist())
+    print(index.contains_many([acg, gat]))
@@ -0,0 +1,235 @@
+from array import array
+from collections import deque
+from typing import BinaryIO, Deque, Dict, Iterable, Iterator, List, Tuple, Union
+from main import Gene
+
+try:
+    import numpy as np
+except ImportError: # numpy необязателен, без него работают чистые Python-версии
+    np = None
+
+Text = Union[str, bytes, Gene]
+
+
+# ген (список кодонов) или строка -> байты нуклеотидов
+def to_bytes(text: Text) -> bytes:
+    if isinstance(text, bytes):
+        return text
+    if isinstance(text, str):
+        return text.encode('ascii')
+    return ''.join(nucleotide.name for codon in text for nucleotide in codon).encode('ascii')
+
+
+# автомат Ахо-Корасик: поиск сразу всех мотивов за один проход по тексту,
+# время O(длина текста + число вхождений) вместо O(текст * мотивы) у linear_contains на каждый мотив
+class AhoCorasick:
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns: List[str] = list(dict.fromkeys(pattern for pattern in patterns if pattern))
+        self._goto: List[Dict[int, int]] = [{}] # переходы бора по байтам
+        self._fail: List[int] = [0] # суффиксные ссылки
+        self._output: List[List[int]] = [[]] # номера мотивов, оканчивающихся в состоянии
+        for number, pattern in enumerate(self.patterns):
+            state: int = 0
+            for symbol in pattern.encode('ascii'):
+                if symbol not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][symbol] = len(self._goto) - 1
+                state = self._goto[state][symbol]
+            self._output[state].append(number)
+        # суффиксные ссылки обходом бора в ширину; выходы состояния дополняются выходами
+        # его суффиксной ссылки, поэтому при поиске по ссылкам ходить не нужно
+        queue: Deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for symbol, child in self._goto[state].items():
+                fail: int = self._fail[state]
+                while fail and symbol not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(symbol, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+                queue.append(child)
+
+    # пары (позиция начала, мотив) в порядке окончания вхождений
+    def finditer(self, text: Text) -> Iterator[Tuple[int, str]]:
+        goto: List[Dict[int, int]] = self._goto
+        fail: List[int] = self._fail
+        output: List[List[int]] = self._output
+        patterns: List[str] = self.patterns
+        state: int = 0
+        for position, symbol in enumerate(to_bytes(text)):
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0)
+            for number in output[state]:
+                yield position - len(patterns[number]) + 1, patterns[number]
+
+    # позиции начала всех вхождений каждого мотива
+    def find_all(self, text: Text) -> Dict[str, List[int]]:
+        found: Dict[str, List[int]] = {pattern: [] for pattern in self.patterns}
+        for position, pattern in self.finditer(text):
+            found[pattern].append(position)
+        for positions in found.values():
+            positions.sort()
+        return found
+
+    # какие мотивы встречаются в тексте хотя бы раз
+    def contains(self, text: Text) -> Dict[str, bool]:
+        found: Dict[str, bool] = {pattern: False for pattern in self.patterns}
+        for _, pattern in self.finditer(text):
+            found[pattern] = True
+        return found
+
+
+# суффиксный массив: начала всех суффиксов текста в лексикографическом порядке
+# строится один раз удвоением префиксов, поиск мотива длины m - два бинарных поиска, O(m log n)
+# индекс можно записать в файл методом write и прочитать методом read, не строя заново
+class SuffixArray:
+    def __init__(self, text: Text, suffixes: Union[array, None] = None) -> None:
+        self.text: bytes = to_bytes(text)
+        self.suffixes: array = suffixes if suffixes is not None else self._build(self.text)
+
+    @staticmethod
+    def _typecode(length: int) -> str:
+        return 'I' if length < (1 << 32) else 'Q'
+
+    # сортировка суффиксов по первым 2k символам на основе рангов по первым k
+    @classmethod
+    def _build(cls, text: bytes) -> array:
+        n: int = len(text)
+        typecode: str = cls._typecode(n)
+        if n == 0:
+            return array(typecode)
+        if np is not None:
+            # начальные ранги - номера различных символов, чтобы они были меньше n
+            rank: np.ndarray = np.unique(np.frombuffer(text, dtype=np.uint8), return_inverse=True)[1].astype(np.int64)
+            k: int = 1
+            while True:
+                second: np.ndarray = np.full(n, -1, dtype=np.int64)
+                second[:n - k] = rank[k:]
+                # пара рангов (rank, second) одним числом - одна сортировка вместо лексикографической
+                key: np.ndarray = rank * (n + 1) + second + 1
+                order: np.ndarray = np.argsort(key)
+                sorted_key: np.ndarray = key[order]
+                changed: np.ndarray = np.empty(n, dtype=np.int64)
+                changed[0] = 0
+                changed[1:] = sorted_key[1:] != sorted_key[:-1]
+                rank = np.empty(n, dtype=np.int64)
+                rank[order] = np.cumsum(changed)
+                if rank.max() == n - 1 or k >= n:
+                    break
+                k *= 2
+            return array(typecode, order.astype(np.uint32 if typecode == 'I' else np.uint64).tobytes())
+        ranks: List[int] = list(text)
+        k = 1
+        while True:
+            keys: List[Tuple[int, int]] = [(ranks[i], ranks[i + k] if i + k < n else -1) for i in range(n)]
+            positions: List[int] = sorted(range(n), key=keys.__getitem__)
+            new_rank: int = 0
+            ranks = [0] * n
+            for previous, current in zip(positions, positions[1:]):
+                if keys[current] != keys[previous]:
+                    new_rank += 1
+                ranks[current] = new_rank
+            if new_rank == n - 1 or k >= n:
+                return array(typecode, positions)
+            k *= 2
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    # полуинтервал [low, high) суффиксов, начинающихся с pattern
+    def _range(self, pattern: bytes) -> Tuple[int, int]:
+        text: bytes = self.text
+        suffixes: array = self.suffixes
+        m: int = len(pattern)
+        low: int = 0
+        high: int = len(suffixes)
+        while low < high:
+            mid: int = (low + high) // 2
+            if text[suffixes[mid]:suffixes[mid] + m] < pattern:
+                low = mid + 1
+            else:
+                high = mid
+        start: int = low
+        high = len(suffixes)
+        while low < high:
+            mid = (low + high) // 2
+            if text[suffixes[mid]:suffixes[mid] + m] <= pattern:
+                low = mid + 1
+            else:
+                high = mid
+        return start, low
+
+    def count(self, pattern: str) -> int:
+        low, high = self._range(pattern.encode('ascii'))
+        return high - low
+
+    def __contains__(self, pattern: str) -> bool:
+        return self.count(pattern) > 0
+
+    # позиции начала всех вхождений pattern по возрастанию
+    def find(self, pattern: str) -> List[int]:
+        low, high = self._range(pattern.encode('ascii'))
+        return sorted(self.suffixes[low:high])
+
+    # формат: длина текста (8 байт), размер элемента массива (1 байт), текст, массив (little-endian)
+    def write(self, target: BinaryIO) -> None:
+        target.write(len(self.text).to_bytes(8, 'big'))
+        target.write(self.suffixes.itemsize.to_bytes(1, 'big'))
+        target.write(self.text)
+        suffixes: array = self.suffixes
+        if array('H', [1]).tobytes() != b'\x01\x00': # big-endian платформа
+            suffixes = array(suffixes.typecode, suffixes)
+            suffixes.byteswap()
+        target.write(suffixes.tobytes())
+
+    @classmethod
+    def read(cls, source: BinaryIO) -> 'SuffixArray':
+        length: int = int.from_bytes(source.read(8), 'big')
+        itemsize: int = int.from_bytes(source.read(1), 'big')
+        text: bytes = source.read(length)
+        data: bytes = source.read(length * itemsize)
+        if len(text) != length or len(data) != length * itemsize:
+            raise ValueError('Suffix array is truncated')
+        suffixes: array = array('I' if itemsize == array('I').itemsize else 'Q')
+        suffixes.frombytes(data)
+        if array('H', [1]).tobytes() != b'\x01\x00':
+            suffixes.byteswap()
+        return cls(text, suffixes)
+
+
+# поиск сотни мотивов: linear_contains-подобный перебор, автомат и суффиксный массив
+def benchmark(length: int = 1_000_000, motifs: int = 200, motif_length: int = 8, seed: int = 1) -> None:
+    from timeit import default_timer as timer
+    import random
+    random.seed(seed)
+    text: str = ''.join(random.choice('ACGT') for _ in range(length))
+    patterns: List[str] = [''.join(random.choice('ACGT') for _ in range(motif_length)) for _ in range(motifs)]
+    start: float = timer()
+    naive: int = sum(pattern in text for pattern in patterns)
+    print('str.__contains__ per motif: {:.3f}s ({} found)'.format(timer() - start, naive))
+    start = timer()
+    automaton: AhoCorasick = AhoCorasick(patterns)
+    found: int = sum(automaton.contains(text).values())
+    print('Aho-Corasick: {:.3f}s ({} found)'.format(timer() - start, found))
+    start = timer()
+    index: SuffixArray = SuffixArray(text)
+    built: float = timer() - start
+    start = timer()
+    found = sum(pattern in index for pattern in patterns)
+    print('SuffixArray: built in {:.3f}s, queried in {:.4f}s ({} found)'.format(built, timer() - start, found))
+
+
+if __name__ == '__main__':
+    from io import BytesIO
+    from main import gene_str, my_gene
+    automaton: AhoCorasick = AhoCorasick(['ACG', 'GCT', 'CCC', 'GAT'])
+    print(automaton.find_all(my_gene))
+    index: SuffixArray = SuffixArray(gene_str)
+    print(index.find('GCT'), index.count('CGC'), 'TTT' in index)
+    buffer: BytesIO = BytesIO()
+    index.write(buffer)
+    buffer.seek(0)
+    print(SuffixArray.read(buffer).find('GCT'))
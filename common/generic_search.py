@@ -0,0 +1,833 @@
+from __future__ import annotations
+from array import array
+from typing import TypeVar, Iterable, Iterator, Sequence, Generic, List, Callable, Set, Deque, Dict, Any, Optional, Tuple, Union
+from typing_extensions import Protocol
+from collections import OrderedDict, Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from heapq import heappush, heappop
+from bisect import bisect_left
+from math import sqrt
+from numbers import Real
+from os import cpu_count
+from time import perf_counter
+
+try:
+    import numpy as np
+except ImportError: # numpy необязателен, без него работают чистые Python-версии
+    np = None
+
+T = TypeVar('T')
+K = TypeVar('K')
+V = TypeVar('V')
+
+# обощенная функция линейного поиска
+def linear_contains(iterable: Iterable[T], key: T) -> bool:
+    for item in iterable:
+        if item == key:
+            return True
+    return False
+
+C = TypeVar('C', bound='Comparable')
+class Comparable(Protocol):
+    def __eq__(self, other: Any) -> bool:
+        return self == other
+
+    def __lt__(self: C, other: Any) -> bool:
+        return self < other
+
+    # больше чем
+    def __gt__(self: C, other: C) -> bool:
+        return (not self < other) and self != other
+
+    # больше или равно
+    def __ge__(self: C, other: C) -> bool:
+        return not self < other
+
+# обощенная функция бинарного поиска
+def binary_contains(sequence: Sequence[C], key: C) -> bool:
+    low: int = 0
+    high: int = len(sequence) - 1
+    while low <= high:
+        mid: int = (low + high) // 2
+        if sequence[mid] < key:
+            low = mid + 1
+        elif sequence[mid] > key:
+            high = mid - 1
+        else:
+            return True
+    return False
+
+# numpy-массив, если данные числовые, иначе None (строки, кортежи и т.п. идут чистым Python)
+# numpy-массивы и array.array берутся как есть (без копии), у остальных последовательностей
+# сначала проверяется первый элемент: преобразовывать в массив заведомо нечисловые данные
+# (например, список длинных строк) слишком дорого
+def _numeric_array(values: Iterable[Any]) -> Optional['np.ndarray']:
+    if np is None:
+        return None
+    if not isinstance(values, (np.ndarray, array)):
+        if not isinstance(values, Sequence) or len(values) == 0:
+            return None
+        first: Any = values[0]
+        if not isinstance(first, Real) or isinstance(first, bool):
+            return None
+    try:
+        result: np.ndarray = np.asarray(values)
+    except (TypeError, ValueError):
+        return None
+    return result if result.ndim == 1 and result.dtype.kind in 'iuf' else None
+
+# пакетный линейный поиск: один проход по iterable в множество, затем O(1) на ключ;
+# числовые данные проверяются через numpy.isin
+# результат - numpy-массив bool (если numpy доступен) или список bool в порядке keys
+def linear_contains_many(iterable: Iterable[T], keys: Sequence[T]) -> Union[List[bool], 'np.ndarray']:
+    items: List[T] = iterable if isinstance(iterable, Sequence) or (np is not None and isinstance(iterable, np.ndarray)) \
+        else list(iterable)
+    numeric_items: Optional[np.ndarray] = _numeric_array(items)
+    numeric_keys: Optional[np.ndarray] = _numeric_array(keys) if numeric_items is not None else None
+    if numeric_keys is not None:
+        return np.isin(numeric_keys, numeric_items)
+    try:
+        members: Set[T] = set(items)
+        found: List[bool] = [key in members for key in keys]
+    except TypeError: # нехешируемые элементы
+        found = [linear_contains(items, key) for key in keys]
+    return np.array(found, dtype=bool) if np is not None else found
+
+# пакетный бинарный поиск, sequence должна быть отсортирована
+# числовые данные - один вызов numpy.searchsorted на все ключи;
+# иначе bisect, причем для отсортированных keys поиск каждого следующего ключа начинается
+# с позиции предыдущего (слияние двух отсортированных последовательностей)
+def binary_contains_many(sequence: Sequence[C], keys: Sequence[C]) -> Union[List[bool], 'np.ndarray']:
+    numeric_sequence: Optional[np.ndarray] = _numeric_array(sequence)
+    numeric_keys: Optional[np.ndarray] = _numeric_array(keys) if numeric_sequence is not None else None
+    if numeric_keys is not None:
+        if len(numeric_sequence) == 0:
+            return np.zeros(len(numeric_keys), dtype=bool)
+        positions: np.ndarray = np.searchsorted(numeric_sequence, numeric_keys)
+        np.minimum(positions, len(numeric_sequence) - 1, out=positions)
+        return numeric_sequence[positions] == numeric_keys
+    length: int = len(sequence)
+    found: List[bool] = []
+    if all(previous <= current for previous, current in zip(keys, keys[1:])):
+        position: int = 0
+        for key in keys:
+            position = bisect_left(sequence, key, position)
+            found.append(position < length and sequence[position] == key)
+    else:
+        for key in keys:
+            index: int = bisect_left(sequence, key)
+            found.append(index < length and sequence[index] == key)
+    return np.array(found, dtype=bool) if np is not None else found
+
+# обобщенный стек
+class Stack(Generic[T]):
+    def __init__(self) -> None:
+        self._container: List[T] = []
+
+    @property
+    def empty(self) -> bool:
+        return not self._container
+
+    def push(self, item: T) -> None:
+        self._container.append(item)
+
+    def pop(self) -> T:
+        return self._container.pop()
+
+    def __repr__(self) -> str:
+        return repr(self._container)
+
+# очередь
+class Queue(Generic[T]):
+    def __init__(self):
+        self._container: Deque[T] = Deque()
+
+    @property
+    def empty(self) -> bool:
+        return not self._container
+
+    def push(self, item: T) -> None:
+        self._container.append(item) # добавляем новые элементы в конец (справа)
+
+    def pop(self) -> T:
+        return self._container.popleft() # красивый способ извлечь первый (левый) элемент
+
+    def __repr__(self) -> str:
+        return repr(self._container)
+
+# очередь с приоритетом на базе кучи
+class PriorityQueue(Generic[T]):
+    def __init__(self) -> None:
+        self._container: List[T] = []
+
+    @property
+    def empty(self) -> bool:
+        return not self._container
+
+    def push(self, item: T) -> None:
+        heappush(self._container, item)
+
+    def pop(self) -> T:
+        return heappop(self._container)
+
+    # минимальный элемент без извлечения
+    def peek(self) -> T:
+        return self._container[0]
+
+    def __repr__(self) -> str:
+        return repr(self._container)
+
+# словарь ограниченного размера: при переполнении вытесняется
+# элемент, к которому дольше всего не обращались
+class LRUCache(Generic[K, V]):
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize: int = maxsize
+        self._container: OrderedDict[K, V] = OrderedDict()
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        if key not in self._container:
+            return default
+        self._container.move_to_end(key)
+        return self._container[key]
+
+    def put(self, key: K, value: V) -> None:
+        self._container[key] = value
+        self._container.move_to_end(key)
+        if len(self._container) > self.maxsize:
+            self._container.popitem(last=False)
+
+    def clear(self) -> None:
+        self._container.clear()
+
+    def discard(self, key: K) -> None:
+        self._container.pop(key, None)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._container
+
+    def __len__(self) -> int:
+        return len(self._container)
+
+    def __repr__(self) -> str:
+        return repr(self._container)
+
+# кеширующая обертка над successors или heuristic: повторные вызовы для того же состояния,
+# в том числе в следующих поисках по той же области, берутся из LRU-кеша на maxsize записей
+# передается в dfs/bfs/astar вместо исходной функции; если область меняется
+# (например, клетка лабиринта), устаревшие записи сбрасываются через invalidate
+class Memoized(Generic[K, V]):
+    def __init__(self, function: Callable[[K], V], maxsize: int = 1 << 16) -> None:
+        self.function: Callable[[K], V] = function
+        self.hits: int = 0
+        self.misses: int = 0
+        self._cache: LRUCache[K, V] = LRUCache(maxsize)
+        self._missing: Any = object()
+
+    def __call__(self, key: K) -> V:
+        value: Any = self._cache.get(key, self._missing)
+        if value is self._missing:
+            self.misses += 1
+            value = self.function(key)
+            self._cache.put(key, value)
+        else:
+            self.hits += 1
+        return value
+
+    # без аргументов - сброс всего кеша, иначе только записей для указанных состояний
+    def invalidate(self, *keys: K) -> None:
+        if not keys:
+            self._cache.clear()
+        for key in keys:
+            self._cache.discard(key)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __repr__(self) -> str:
+        return 'Memoized({!r}, hits={}, misses={}, size={})'.format(self.function, self.hits, self.misses, len(self._cache))
+
+# __slots__ убирает у каждого узла собственный __dict__,
+# поэтому память на одно посещенное состояние уменьшается в несколько раз
+class Node(Generic[T]):
+    __slots__ = ('state', 'parent', 'cost', 'heuristic')
+
+    def __init__(self, state: T, parent: Optional[Node], cost: float = 0.0, heuristic: float = 0.0) -> None:
+        self.state: T = state
+        self.parent: Optional[Node] = parent
+        self.cost: float = cost
+        self.heuristic: float = heuristic
+    
+    # при равной оценке f = g + h первым извлекается узел с большей стоимостью g,
+    # то есть более близкий к цели: на открытых сетках это резко сокращает число раскрытий
+    def __lt__(self, other: Node) -> bool:
+        f: float = self.cost + self.heuristic
+        other_f: float = other.cost + other.heuristic
+        return f < other_f or (f == other_f and self.cost > other.cost)
+
+# функция, которая извлечет из Node путь по лабиринту
+def node_to_path(node: Node[T]) -> List[T]:
+    path: List[T] = [node.state]
+    # двигаемся от конца к началу
+    while node.parent is not None:
+        node = node.parent
+        path.append(node.state)
+    path.reverse()
+    return path
+
+# статистика поиска: передается в dfs/bfs/astar через параметр stats и заполняется ими
+# без stats поиск идет по обычному пути - обертки над successors, heuristic и frontier
+# подставляются только при включенной статистике, поэтому в выключенном виде накладных расходов нет
+# один объект можно передавать в несколько поисков подряд - счетчики суммируются, peak_frontier - максимум
+# depth_histogram - считать число извлеченных узлов по глубине (глубина запоминается в _TracedFrontier
+# при добавлении узла: глубина родителя + 1, без прохода по цепочке parent)
+# on_pop(node) - пользовательский хук, вызывается для каждого извлеченного из frontier узла
+class SearchStats:
+    def __init__(self, depth_histogram: bool = False, on_pop: Optional[Callable[[Node], None]] = None,
+                 clock: Callable[[], float] = perf_counter) -> None:
+        self.popped: int = 0 # извлечено из frontier (в astar включая устаревшие записи)
+        self.expanded: int = 0 # вызовов successors
+        self.generated: int = 0 # потомков, возвращенных successors
+        self.peak_frontier: int = 0
+        self.successor_time: float = 0.0
+        self.heuristic_calls: int = 0
+        self.heuristic_time: float = 0.0
+        self.depth_histogram: Optional[Counter] = Counter() if depth_histogram else None
+        self.on_pop: Optional[Callable[[Node], None]] = on_pop
+        self._clock: Callable[[], float] = clock
+
+    def reset(self) -> None:
+        self.popped = self.expanded = self.generated = self.peak_frontier = self.heuristic_calls = 0
+        self.successor_time = self.heuristic_time = 0.0
+        if self.depth_histogram is not None:
+            self.depth_histogram.clear()
+
+    # successors с подсчетом вызовов, потомков и времени
+    def trace_successors(self, successors: Callable[[T], List[T]]) -> Callable[[T], List[T]]:
+        clock: Callable[[], float] = self._clock
+        def traced(state: T) -> List[T]:
+            start: float = clock()
+            children: List[T] = successors(state)
+            self.successor_time += clock() - start
+            self.expanded += 1
+            self.generated += len(children)
+            return children
+        return traced
+
+    # heuristic с подсчетом вызовов и времени
+    def trace_heuristic(self, heuristic: Callable[[T], float]) -> Callable[[T], float]:
+        clock: Callable[[], float] = self._clock
+        def traced(state: T) -> float:
+            start: float = clock()
+            estimate: float = heuristic(state)
+            self.heuristic_time += clock() - start
+            self.heuristic_calls += 1
+            return estimate
+        return traced
+
+    def _record_pop(self, node: Node, depth: int) -> None:
+        self.popped += 1
+        if self.depth_histogram is not None:
+            self.depth_histogram[depth] += 1
+        if self.on_pop is not None:
+            self.on_pop(node)
+
+    def __repr__(self) -> str:
+        return ('SearchStats(popped={}, expanded={}, generated={}, peak_frontier={}, successor_time={:.6f}, '
+                'heuristic_calls={}, heuristic_time={:.6f})').format(
+                    self.popped, self.expanded, self.generated, self.peak_frontier,
+                    self.successor_time, self.heuristic_calls, self.heuristic_time)
+
+# обертка над Stack/Queue/PriorityQueue, которая сообщает в SearchStats о размере и извлечениях
+# глубина узла запоминается при добавлении: глубина родителя + 1
+# (родитель - как правило, только что извлеченный узел), поэтому гистограмма стоит O(1) на узел
+class _TracedFrontier(Generic[T]):
+    def __init__(self, frontier: Any, stats: SearchStats) -> None:
+        self._frontier: Any = frontier
+        self._stats: SearchStats = stats
+        self._size: int = 0
+        self._track_depth: bool = stats.depth_histogram is not None
+        self._depths: Dict[Node, int] = {} # глубины узлов, находящихся во frontier
+        self._last_node: Optional[Node] = None # последний извлеченный узел и его глубина
+        self._last_depth: int = 0
+
+    @property
+    def empty(self) -> bool:
+        return self._frontier.empty
+
+    def push(self, item: T) -> None:
+        self._frontier.push(item)
+        self._size += 1
+        if self._size > self._stats.peak_frontier:
+            self._stats.peak_frontier = self._size
+        if self._track_depth:
+            self._depths[item] = self._depth(item)
+
+    def _depth(self, node: Node) -> int:
+        parent: Optional[Node] = node.parent
+        if parent is None:
+            return 0
+        if parent is self._last_node:
+            return self._last_depth + 1
+        depth: Optional[int] = self._depths.get(parent)
+        if depth is not None:
+            return depth + 1
+        depth = 1 # родитель нигде не запомнен - считаем по цепочке
+        while parent.parent is not None:
+            depth += 1
+            parent = parent.parent
+        return depth
+
+    def pop(self) -> T:
+        item: T = self._frontier.pop()
+        self._size -= 1
+        depth: int = 0
+        if self._track_depth:
+            depth = self._depths.pop(item)
+            self._last_node, self._last_depth = item, depth
+        self._stats._record_pop(item, depth)
+        return item
+
+    def __repr__(self) -> str:
+        return repr(self._frontier)
+
+# поиск в глубину
+def dfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]],
+        stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
+    # frontier - то, что нужно проверить
+    frontier: Stack[Node[T]] = Stack()
+    if stats is not None:
+        frontier = _TracedFrontier(frontier, stats)
+        successors = stats.trace_successors(successors)
+    frontier.push(Node(initial, None))
+
+    # explored - где мы уже побывали
+    explored: Set[T] = {initial}
+
+    # пока есть что просматривать, просматриваем frontier
+    while not frontier.empty:
+        current_node: Node[T] = frontier.pop()
+        current_state: T = current_node.state
+        # если мы нашли искомое, то заканчиваем
+        if goal_test(current_state):
+            return current_node
+        # проверяем куда можно идти дальше
+        for child in successors(current_state):
+            if child in explored: # пропускаем состояния, которые уже исследовали
+                continue
+            explored.add(child)
+            frontier.push(Node(child, current_node))
+    return None # все состояния проверили, пути к цели не нашли
+
+# поиск в ширину
+def bfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]],
+        stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
+    # frontier - то, что нужно проверить
+    frontier: Queue[Node[T]] = Queue()
+    if stats is not None:
+        frontier = _TracedFrontier(frontier, stats)
+        successors = stats.trace_successors(successors)
+    frontier.push(Node(initial, None))
+
+    # explored - где мы уже побывали
+    explored: Set[T] = {initial}
+
+    # пока есть что просматривать, просматриваем frontier
+    while not frontier.empty:
+        current_node: Node[T] = frontier.pop()
+        current_state: T = current_node.state
+        # если мы нашли искомое, то заканчиваем
+        if goal_test(current_state):
+            return current_node
+        # проверяем куда можно идти дальше
+        for child in successors(current_state):
+            if child in explored: # пропускаем состояния, которые уже исследовали
+                continue
+            explored.add(child)
+            frontier.push(Node(child, current_node))
+    return None # все состояния проверили, пути к цели не нашли
+
+# successors, установленная в процессе пула функцией _install_successors
+_worker_successors: Optional[Callable[[Any], List[Any]]] = None
+
+# инициализатор процесса пула: successors (вместе с областью, например лабиринтом)
+# передается в каждый процесс один раз, а не с каждой пачкой состояний
+def _install_successors(successors: Callable[[Any], List[Any]]) -> None:
+    global _worker_successors
+    _worker_successors = successors
+
+def _expand_chunk(states: List[Any]) -> List[List[Any]]:
+    return [_worker_successors(state) for state in states]
+
+# поиск в ширину по уровням: successors всех состояний уровня вычисляются пачками параллельно,
+# а проверка explored и построение следующего уровня идут в основном процессе в том же порядке,
+# что и в bfs, поэтому результат совпадает с bfs
+# по умолчанию создается ProcessPoolExecutor на workers процессов, в который successors
+# устанавливается один раз инициализатором, а в пачках передаются только состояния
+# (successors должна сериализоваться pickle: функция модуля или метод сериализуемого объекта)
+# можно передать свой executor (например, ThreadPoolExecutor) - тогда successors
+# отправляется через executor.map; уровни меньше min_batch раскрываются без пула
+def parallel_bfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]],
+                 executor: Optional[Executor] = None, workers: Optional[int] = None,
+                 min_batch: int = 64) -> Optional[Node[T]]:
+    own_executor: bool = executor is None
+    workers = workers or cpu_count() or 1
+    try:
+        level: List[Node[T]] = [Node(initial, None)]
+        explored: Set[T] = {initial}
+        while level:
+            # bfs извлек бы все состояния уровня раньше потомков любого из них
+            for node in level:
+                if goal_test(node.state):
+                    return node
+            states: List[T] = [node.state for node in level]
+            # по несколько пачек на процесс, чтобы выровнять нагрузку
+            chunk: int = max(1, len(states) // (4 * workers))
+            children_lists: Iterable[List[T]]
+            if len(states) < min_batch:
+                children_lists = map(successors, states)
+            elif own_executor:
+                if executor is None:
+                    executor = ProcessPoolExecutor(workers, initializer=_install_successors, initargs=(successors,))
+                chunks: List[List[T]] = [states[i:i + chunk] for i in range(0, len(states), chunk)]
+                children_lists = (children for expanded in executor.map(_expand_chunk, chunks)
+                                  for children in expanded)
+            else:
+                children_lists = executor.map(successors, states, chunksize=chunk)
+            next_level: List[Node[T]] = []
+            for node, children in zip(level, children_lists):
+                for child in children:
+                    if child in explored:
+                        continue
+                    explored.add(child)
+                    next_level.append(Node(child, node))
+            level = next_level
+        return None
+    finally:
+        if own_executor and executor is not None:
+            executor.shutdown()
+        
+# cost(state, child) - стоимость шага, по умолчанию 1 (сетка)
+# stats - необязательный SearchStats для сбора статистики
+def astar(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], heuristic: Callable[[T], float],
+          cost: Optional[Callable[[T, T], float]] = None, stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
+    # frontier - то, куда хотим двигаться
+    frontier: PriorityQueue[Node[T]] = PriorityQueue()
+    if stats is not None:
+        frontier = _TracedFrontier(frontier, stats)
+        successors = stats.trace_successors(successors)
+        heuristic = stats.trace_heuristic(heuristic)
+    frontier.push(Node(initial, None, 0.0, heuristic(initial)))
+
+    # explored - то, что уже просмотрели, с лучшей известной стоимостью
+    explored: Dict[T, float] = {initial: 0.0}
+
+    # продолжаем пока есть что просматривать
+    while not frontier.empty:
+        current_node: Node[T] = frontier.pop()
+        current_state: T = current_node.state
+        # устаревшая запись: к состоянию уже нашли путь дешевле, повторно не раскрываем
+        if current_node.cost > explored[current_state]:
+            continue
+        # если цель найдена, мы закончили
+        if goal_test(current_state):
+            return current_node
+        # проверяем в какую из неисследованных ячеек направиться
+        for child in successors(current_state):
+            new_cost: float = current_node.cost + (1 if cost is None else cost(current_state, child))
+            if child not in explored or explored[child] > new_cost:
+                explored[child] = new_cost
+                frontier.push(Node(child, current_node, new_cost, heuristic(child)))
+    return None # все проверили, пути к целевой точке не нашли
+
+
+# дерево кратчайших путей от одного источника: parents[state] - предыдущее состояние на пути,
+# distances[state] - длина (стоимость) пути от initial
+class SearchTree(Generic[T]):
+    def __init__(self, initial: T, parents: Dict[T, Optional[T]], distances: Dict[T, float]) -> None:
+        self.initial: T = initial
+        self.parents: Dict[T, Optional[T]] = parents
+        self.distances: Dict[T, float] = distances
+
+    def __contains__(self, state: Any) -> bool:
+        return state in self.parents
+
+    # путь initial -> goal за O(длины пути), None если goal не достигнута
+    def path(self, goal: T) -> Optional[List[T]]:
+        if goal not in self.parents:
+            return None
+        path: List[T] = [goal]
+        state: Optional[T] = self.parents[goal]
+        while state is not None:
+            path.append(state)
+            state = self.parents[state]
+        path.reverse()
+        return path
+
+    # то же в виде цепочки Node, совместимой с node_to_path
+    def node(self, goal: T) -> Optional[Node[T]]:
+        path: Optional[List[T]] = self.path(goal)
+        if path is None:
+            return None
+        node: Optional[Node[T]] = None
+        for state in path:
+            node = Node(state, node, self.distances[state])
+        return node
+
+# один поиск от initial вместо отдельного bfs/astar на каждую цель
+# без cost - поиск в ширину, с cost(state, child) - алгоритм Дейкстры
+# goals - необязательный набор целей: поиск прекращается, как только найдены все;
+# без goals строится полное дерево достижимых состояний
+def search_tree(initial: T, successors: Callable[[T], List[T]], goals: Optional[Iterable[T]] = None,
+                cost: Optional[Callable[[T, T], float]] = None) -> SearchTree[T]:
+    parents: Dict[T, Optional[T]] = {initial: None}
+    distances: Dict[T, float] = {initial: 0.0}
+    remaining: Optional[Set[T]] = set(goals) if goals is not None else None
+    if remaining is not None:
+        remaining.discard(initial)
+        if not remaining:
+            return SearchTree(initial, parents, distances)
+    if cost is None:
+        # в ширину: расстояние окончательно уже в момент первого обнаружения состояния
+        frontier: Deque[T] = Deque([initial])
+        while frontier:
+            state: T = frontier.popleft()
+            distance: float = distances[state] + 1
+            for child in successors(state):
+                if child in parents:
+                    continue
+                parents[child] = state
+                distances[child] = distance
+                frontier.append(child)
+                if remaining is not None:
+                    remaining.discard(child)
+                    if not remaining:
+                        return SearchTree(initial, parents, distances)
+        return SearchTree(initial, parents, distances)
+    # Дейкстра: расстояние окончательно, когда состояние извлекается из кучи
+    heap: List[Tuple[float, int, T]] = [(0.0, 0, initial)]
+    counter: int = 1 # порядковый номер - чтобы куча не сравнивала сами состояния
+    settled: Set[T] = set()
+    while heap:
+        distance, _, state = heappop(heap)
+        if state in settled: # устаревшая запись
+            continue
+        settled.add(state)
+        if remaining is not None:
+            remaining.discard(state)
+            if not remaining:
+                break
+        for child in successors(state):
+            new_distance: float = distance + cost(state, child)
+            if child not in distances or distances[child] > new_distance:
+                distances[child] = new_distance
+                parents[child] = state
+                heappush(heap, (new_distance, counter, child))
+                counter += 1
+    if heap:
+        # поиск остановлен досрочно: у неизвлеченных состояний оценки временные,
+        # убираем их, чтобы в дереве были только кратчайшие пути
+        for state in [state for state in parents if state not in settled]:
+            del parents[state]
+            del distances[state]
+    return SearchTree(initial, parents, distances)
+
+# раскрывает один уровень фронта целиком
+# возвращает следующий уровень и состояние, в котором встретились два поиска
+def _expand_level(frontier: List[T], parents: Dict[T, Optional[T]], other: Dict[T, Optional[T]],
+                  neighbours: Callable[[T], List[T]]) -> Tuple[List[T], Optional[T]]:
+    next_frontier: List[T] = []
+    meeting: Optional[T] = None
+    for state in frontier:
+        for child in neighbours(state):
+            if child in parents:
+                continue
+            parents[child] = state
+            next_frontier.append(child)
+            if meeting is None and child in other:
+                meeting = child
+    return next_frontier, meeting
+
+# склеивает путь initial -> meeting из forward и meeting -> goal из backward в цепочку Node
+def _join_parents(meeting: T, forward: Dict[T, Optional[T]], backward: Dict[T, Optional[T]]) -> Node[T]:
+    states: List[T] = []
+    state: Optional[T] = meeting
+    while state is not None:
+        states.append(state)
+        state = forward[state]
+    states.reverse()
+    state = backward[meeting]
+    while state is not None:
+        states.append(state)
+        state = backward[state]
+    node: Optional[Node[T]] = None
+    for depth, state in enumerate(states):
+        node = Node(state, node, float(depth))
+    return node
+
+# двунаправленный поиск в ширину от initial и от goal одновременно
+# predecessors(state) - состояния, из которых можно попасть в state;
+# если ходы обратимы (как в Maze), достаточно successors
+# каждый раз целиком раскрывается уровень меньшего фронта, поиск останавливается при встрече фронтов
+def bidirectional_bfs(initial: T, goal: T, successors: Callable[[T], List[T]],
+                      predecessors: Optional[Callable[[T], List[T]]] = None) -> Optional[Node[T]]:
+    if predecessors is None:
+        predecessors = successors
+    forward: Dict[T, Optional[T]] = {initial: None}
+    backward: Dict[T, Optional[T]] = {goal: None}
+    if initial == goal:
+        return _join_parents(initial, forward, backward)
+    forward_frontier: List[T] = [initial]
+    backward_frontier: List[T] = [goal]
+    while forward_frontier and backward_frontier:
+        meeting: Optional[T]
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meeting = _expand_level(forward_frontier, forward, backward, successors)
+        else:
+            backward_frontier, meeting = _expand_level(backward_frontier, backward, forward, predecessors)
+        if meeting is not None:
+            return _join_parents(meeting, forward, backward)
+    return None # фронты не встретились, пути нет
+
+# двунаправленный A*: heuristic оценивает расстояние до goal, reverse_heuristic - до initial
+# на каждом шаге раскрывается сторона с меньшей оценкой f; поиск заканчивается,
+# когда нижняя граница max(min f вперед, min f назад) не меньше лучшего найденного пути
+def bidirectional_astar(initial: T, goal: T, successors: Callable[[T], List[T]], heuristic: Callable[[T], float],
+                        reverse_heuristic: Callable[[T], float],
+                        predecessors: Optional[Callable[[T], List[T]]] = None,
+                        cost: Optional[Callable[[T, T], float]] = None) -> Optional[Node[T]]:
+    if predecessors is None:
+        predecessors = successors
+    forward_frontier: PriorityQueue[Node[T]] = PriorityQueue()
+    backward_frontier: PriorityQueue[Node[T]] = PriorityQueue()
+    # лучшие известные узлы для каждого состояния с обеих сторон
+    forward: Dict[T, Node[T]] = {initial: Node(initial, None, 0.0, heuristic(initial))}
+    backward: Dict[T, Node[T]] = {goal: Node(goal, None, 0.0, reverse_heuristic(goal))}
+    forward_frontier.push(forward[initial])
+    backward_frontier.push(backward[goal])
+
+    best: float = float('inf')
+    meeting: Optional[Tuple[Node[T], Node[T]]] = None
+    if initial == goal:
+        best, meeting = 0.0, (forward[initial], backward[goal])
+
+    while not forward_frontier.empty and not backward_frontier.empty:
+        forward_top: Node[T] = forward_frontier.peek()
+        backward_top: Node[T] = backward_frontier.peek()
+        forward_f: float = forward_top.cost + forward_top.heuristic
+        backward_f: float = backward_top.cost + backward_top.heuristic
+        if max(forward_f, backward_f) >= best:
+            break
+        is_forward: bool = forward_f <= backward_f
+        frontier: PriorityQueue[Node[T]] = forward_frontier if is_forward else backward_frontier
+        nodes: Dict[T, Node[T]] = forward if is_forward else backward
+        other: Dict[T, Node[T]] = backward if is_forward else forward
+        current_node: Node[T] = frontier.pop()
+        current_state: T = current_node.state
+        # устаревшая запись: к состоянию уже нашли путь дешевле
+        if current_node.cost > nodes[current_state].cost:
+            continue
+        for child in (successors if is_forward else predecessors)(current_state):
+            step: float = 1.0
+            if cost is not None:
+                step = cost(current_state, child) if is_forward else cost(child, current_state)
+            new_cost: float = current_node.cost + step
+            if child in nodes and nodes[child].cost <= new_cost:
+                continue
+            child_node: Node[T] = Node(child, current_node, new_cost,
+                                       heuristic(child) if is_forward else reverse_heuristic(child))
+            nodes[child] = child_node
+            frontier.push(child_node)
+            if child in other and new_cost + other[child].cost < best:
+                best = new_cost + other[child].cost
+                meeting = (child_node, other[child]) if is_forward else (other[child], child_node)
+
+    if meeting is None:
+        return None # пути к цели нет
+    # продолжаем прямую цепочку узлами обратного поиска; стоимость узла - best минус остаток до goal
+    node, backward_node = meeting
+    while backward_node.parent is not None:
+        backward_node = backward_node.parent
+        node = Node(backward_node.state, node, best - backward_node.cost)
+    return node
+
+# поиск в глубину с ограничением bound на f = g + h
+# в памяти только текущий путь (узлы и итераторы по их потомкам)
+# и, если передана, таблица транспозиций с наименьшей стоимостью g каждого встреченного состояния
+# возвращает найденный узел и наименьшее f, превысившее bound (следующую границу)
+def _bounded_dfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]],
+                 heuristic: Callable[[T], float], cost: Optional[Callable[[T, T], float]], bound: float,
+                 table: Optional[LRUCache[T, float]]) -> Tuple[Optional[Node[T]], float]:
+    root: Node[T] = Node(initial, None, 0.0, heuristic(initial))
+    if root.heuristic > bound:
+        return None, root.heuristic
+    if goal_test(initial):
+        return root, bound
+    if table is not None:
+        table.put(initial, 0.0)
+    next_bound: float = float('inf')
+    done: object = object() # метка исчерпанного итератора
+    path: List[Tuple[Node[T], Iterator[T]]] = [(root, iter(successors(initial)))]
+    on_path: Set[T] = {initial}
+    while path:
+        current_node, children = path[-1]
+        child = next(children, done)
+        if child is done:
+            path.pop()
+            on_path.discard(current_node.state)
+            continue
+        if child in on_path: # не ходим по циклам
+            continue
+        new_cost: float = current_node.cost + (1 if cost is None else cost(current_node.state, child))
+        if table is not None:
+            seen: Optional[float] = table.get(child)
+            if seen is not None and seen <= new_cost: # сюда уже приходили не дороже
+                continue
+            table.put(child, new_cost)
+        h: float = heuristic(child)
+        if new_cost + h > bound:
+            next_bound = min(next_bound, new_cost + h)
+            continue
+        child_node: Node[T] = Node(child, current_node, new_cost, h)
+        if goal_test(child):
+            return child_node, next_bound
+        path.append((child_node, iter(successors(child))))
+        on_path.add(child)
+    return None, next_bound
+
+# IDA*: поиск в глубину с постепенно растущей границей f = g + h
+# память O(глубины) плюс необязательная таблица транспозиций на table_size состояний
+def ida_star(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]],
+             heuristic: Callable[[T], float], cost: Optional[Callable[[T, T], float]] = None,
+             table_size: int = 0) -> Optional[Node[T]]:
+    table: Optional[LRUCache[T, float]] = LRUCache(table_size) if table_size > 0 else None
+    bound: float = heuristic(initial)
+    while bound < float('inf'):
+        if table is not None:
+            table.clear() # стоимости из прошлой итерации получены при другой границе
+        result, bound = _bounded_dfs(initial, goal_test, successors, heuristic, cost, bound, table)
+        if result is not None:
+            return result
+    return None # ни одно состояние не отсечено границей - пути нет
+
+# поиск в глубину с итеративным углублением: IDA* с нулевой эвристикой и единичной стоимостью шага
+# max_depth ограничивает глубину, на которой поиск прекращается
+def iddfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]],
+          max_depth: Optional[int] = None, table_size: int = 0) -> Optional[Node[T]]:
+    table: Optional[LRUCache[T, float]] = LRUCache(table_size) if table_size > 0 else None
+    depth: float = 0
+    while depth < float('inf') and (max_depth is None or depth <= max_depth):
+        if table is not None:
+            table.clear()
+        result, depth = _bounded_dfs(initial, goal_test, successors, lambda _: 0.0, None, depth, table)
+        if result is not None:
+            return result
+    return None
+
+
+if __name__ == '__main__':
+    print(linear_contains([1, 5, 15, 15, 15, 15, 20], 5)) # True
+    print(binary_contains(['a', 'c', 'e', 'x'], 'x')) # True
+    print(binary_contains(['john', 'mark', 'sarah'], 'bob')) # False
+    print(linear_contains_many([1, 5, 15, 15, 15, 15, 20], [5, 7, 20])) # [True False True]
+    print(binary_contains_many(['john', 'mark', 'sarah'], ['bob', 'mark'])) # [False True]
+